@@ -3,7 +3,13 @@ Fantasy OS SHMUP - Flask Backend Entry Point
 Port: 5006
 """
 import os
-from flask import Flask, jsonify
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import orjson
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -15,10 +21,56 @@ from routes.game import game_bp
 from routes.textures import textures_bp
 from routes.sprites import sprites_bp
 from routes.shared import shared_bp
+from routes.batch import batch_bp
+from utils.json_provider import OrjsonProvider
+from services.image_service import start_cache_warmer
+from services.llm_service import TEXT_MODEL, start_llm_warmup
+
+def configure_logging():
+    """
+    Send log records through a queue so console I/O happens on a
+    background listener thread instead of the request thread
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers):
+        return
+    
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    
+    # LiteLLM ships its own console handler; don't print its records twice
+    logging.getLogger('LiteLLM').propagate = False
+
+
+def configure_event_loop():
+    """
+    Use uvloop for asyncio event loops when it is installed (non-Windows);
+    async views and the ASGI server then run on libuv instead of selectors
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 
 def create_app():
     """Application factory pattern"""
+    configure_logging()
+    configure_event_loop()
+    start_cache_warmer()
+    start_llm_warmup()
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -29,7 +81,8 @@ def create_app():
         r"/api/*": {
             "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
             "methods": ["GET", "POST", "PUT", "DELETE"],
-            "allow_headers": ["Content-Type"]
+            "allow_headers": ["Content-Type"],
+            "max_age": 86400  # Let browsers cache preflight responses for 24h
         }
     })
     
@@ -38,24 +91,30 @@ def create_app():
     app.register_blueprint(textures_bp, url_prefix='/api')
     app.register_blueprint(sprites_bp, url_prefix='/api')
     app.register_blueprint(shared_bp, url_prefix='/api')
+    app.register_blueprint(batch_bp, url_prefix='/api')
+    
+    # Static payloads are serialized once; a fresh Response is built per
+    # request because after-request hooks (CORS) mutate its headers
+    health_body = orjson.dumps({"ok": True})
+    version_body = orjson.dumps({
+        "service": "fantasy-os-shmup",
+        "version": "0.1.0",
+        "models": {
+            "text": TEXT_MODEL,
+            "image_primary": os.getenv('IMAGE_MODEL_PRIMARY', 'gemini-2.5-flash-image-preview'),
+            "image_fallback": os.getenv('IMAGE_MODEL_FALLBACK', 'openai/gpt-image-1')
+        }
+    })
     
     # Health check endpoint (no /api prefix)
     @app.route('/health')
     def health():
-        return jsonify({"ok": True}), 200
+        return Response(health_body, status=200, mimetype='application/json')
     
     # Version endpoint
     @app.route('/api/version')
     def version():
-        return jsonify({
-            "service": "fantasy-os-shmup",
-            "version": "0.1.0",
-            "models": {
-                "text": os.getenv('TEXT_MODEL', 'cerebras/llama-3.3-70b'),
-                "image_primary": os.getenv('IMAGE_MODEL_PRIMARY', 'gemini-2.5-flash-image-preview'),
-                "image_fallback": os.getenv('IMAGE_MODEL_FALLBACK', 'openai/gpt-image-1')
-            }
-        }), 200
+        return Response(version_body, status=200, mimetype='application/json')
     
     # Global error handlers
     @app.errorhandler(400)
@@ -87,4 +146,13 @@ if __name__ == '__main__':
     print(f"🚀 Fantasy OS SHMUP Backend starting on port {port}")
     print(f"📡 Health check: http://localhost:{port}/health")
     print(f"📋 Version info: http://localhost:{port}/api/version")
-    app.run(host='0.0.0.0', port=port, debug=True)
+    
+    if os.getenv('FLASK_ENV') == 'development':
+        # Werkzeug debug server with auto-reloader
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # Multi-threaded production server; database access is pooled
+        from waitress import serve
+        threads = int(os.getenv('WSGI_THREADS', 8))
+        print(f"🧵 Serving with waitress ({threads} threads)")
+        serve(app, host='0.0.0.0', port=port, threads=threads)
@@ -0,0 +1,12 @@
+"""
+ASGI entry point
+
+Async views (sprites, textures, patch-story) share the server's event loop
+here instead of spinning up a loop per request:
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5006
+"""
+from asgiref.wsgi import WsgiToAsgi
+from app import create_app
+
+asgi_app = WsgiToAsgi(create_app())
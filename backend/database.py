@@ -3,12 +3,14 @@ Database module for Fantasy OS SHMUP
 Handles SQLite connections and queries for campaigns, sessions, and shared worlds
 """
 import sqlite3
-import json
+import orjson
 import os
+import queue
+import random
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
-from datetime import datetime
-import uuid
+from typing import Optional, Dict, Iterator, List, Tuple, Union
+from models.game_data import GameData
 
 # Database file location
 DB_DIR = Path(__file__).parent / 'data'
@@ -18,6 +20,23 @@ DB_PATH = DB_DIR / 'fantasy_shmup.db'
 # Schema file location
 SCHEMA_PATH = Path(__file__).parent / 'schema.sql'
 
+# Number of warm connections kept in the pool
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+
+# Prepared statements cached per pooled connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# PRAGMAs applied once to every pooled connection when it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection with row factory"""
@@ -26,6 +45,110 @@ def get_connection() -> sqlite3.Connection:
     return conn
 
 
+class ConnectionPool:
+    """
+    Thread-safe pool of warm SQLite connections
+    
+    Reusing connections keeps SQLite's page cache and avoids reopening the
+    database file on every query. Each connection is handed to one thread
+    at a time, so check_same_thread=False is safe.
+    """
+    
+    def __init__(self, db_path: Path, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new pooled connection"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def warm(self):
+        """Open connections until the pool is full"""
+        while not self._idle.full():
+            try:
+                self._idle.put_nowait(self._connect())
+            except queue.Full:
+                break
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one if the pool is empty"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (closed if the pool is full)"""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    @contextmanager
+    def dedicated_connection(self):
+        """
+        Context manager yielding a configured connection outside the pool
+        
+        For long-lived readers (e.g. cursors drained by a streamed response)
+        that would otherwise keep a pooled connection away from requests.
+        The connection is closed on exit.
+        """
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def close_all(self):
+        """Close every idle connection in the pool"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+pool = ConnectionPool(DB_PATH)
+
+
+@contextmanager
+def transaction():
+    """
+    Run several writes on one pooled connection in a single transaction
+    
+    Commits on exit, rolls back if the block raises. Pass the yielded
+    connection to the underscore-prefixed helpers (e.g. _create_session).
+    """
+    with pool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
 def init_database():
     """Initialize database with schema"""
     if not SCHEMA_PATH.exists():
@@ -34,8 +157,15 @@ def init_database():
     with open(SCHEMA_PATH, 'r') as f:
         schema = f.read()
     
+    # Drop pooled handles so they reopen against the freshly initialized file
+    pool.close_all()
+    
     conn = get_connection()
     try:
+        # journal_mode=WAL persists in the file; the rest are per-connection
+        # and are re-applied by the pool for every connection it opens
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         conn.executescript(schema)
         conn.commit()
         print(f"✅ Database initialized: {DB_PATH}")
@@ -58,20 +188,22 @@ def create_campaign(player_id: str) -> str:
         player_id: Unique player identifier
         
     Returns:
-        campaign_id: UUID of created campaign
+        campaign_id: ID of created campaign
     """
-    campaign_id = str(uuid.uuid4())
-    conn = get_connection()
-    
-    try:
-        conn.execute("""
-            INSERT INTO campaigns (campaign_id, player_id)
-            VALUES (?, ?)
-        """, (campaign_id, player_id))
-        conn.commit()
-        return campaign_id
-    finally:
-        conn.close()
+    with transaction() as conn:
+        return _create_campaign(conn, player_id)
+
+
+def _create_campaign(conn: sqlite3.Connection, player_id: str) -> str:
+    """Insert a campaign on an open connection (no commit)"""
+    # IDs are generated by SQLite (also the column default in schema.sql);
+    # the explicit expression keeps files created before that default working
+    row = conn.execute("""
+        INSERT INTO campaigns (campaign_id, player_id)
+        VALUES (lower(hex(randomblob(16))), ?)
+        RETURNING campaign_id
+    """, (player_id,)).fetchone()
+    return row['campaign_id']
 
 
 def get_campaign(campaign_id: str) -> Optional[Dict]:
@@ -84,9 +216,7 @@ def get_campaign(campaign_id: str) -> Optional[Dict]:
     Returns:
         Campaign dict or None if not found
     """
-    conn = get_connection()
-    
-    try:
+    with pool.connection() as conn:
         row = conn.execute("""
             SELECT * FROM campaigns WHERE campaign_id = ?
         """, (campaign_id,)).fetchone()
@@ -94,8 +224,14 @@ def get_campaign(campaign_id: str) -> Optional[Dict]:
         if row:
             return dict(row)
         return None
-    finally:
-        conn.close()
+
+
+def _campaign_exists(conn: sqlite3.Connection, campaign_id: str) -> bool:
+    """Check for a campaign on an open connection"""
+    row = conn.execute("""
+        SELECT 1 FROM campaigns WHERE campaign_id = ?
+    """, (campaign_id,)).fetchone()
+    return row is not None
 
 
 def get_player_campaigns(player_id: str) -> List[Dict]:
@@ -108,9 +244,7 @@ def get_player_campaigns(player_id: str) -> List[Dict]:
     Returns:
         List of campaign dicts
     """
-    conn = get_connection()
-    
-    try:
+    with pool.connection() as conn:
         rows = conn.execute("""
             SELECT * FROM campaigns 
             WHERE player_id = ?
@@ -118,8 +252,6 @@ def get_player_campaigns(player_id: str) -> List[Dict]:
         """, (player_id,)).fetchall()
         
         return [dict(row) for row in rows]
-    finally:
-        conn.close()
 
 
 def update_campaign(campaign_id: str, **kwargs) -> bool:
@@ -133,29 +265,28 @@ def update_campaign(campaign_id: str, **kwargs) -> bool:
     Returns:
         True if updated, False if not found
     """
+    with transaction() as conn:
+        return _update_campaign(conn, campaign_id, **kwargs)
+
+
+def _update_campaign(conn: sqlite3.Connection, campaign_id: str, **kwargs) -> bool:
+    """Update campaign fields on an open connection (no commit)"""
     valid_fields = ['current_stage_num', 'total_score', 'lives', 'bombs', 'power_level']
     updates = {k: v for k, v in kwargs.items() if k in valid_fields}
     
     if not updates:
         return False
     
-    updates['updated_at'] = datetime.now().isoformat()
-    
     set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
     values = list(updates.values()) + [campaign_id]
     
-    conn = get_connection()
-    
-    try:
-        cursor = conn.execute(f"""
-            UPDATE campaigns 
-            SET {set_clause}
-            WHERE campaign_id = ?
-        """, values)
-        conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    cursor = conn.execute(f"""
+        UPDATE campaigns 
+        SET {set_clause},
+            updated_at = CURRENT_TIMESTAMP
+        WHERE campaign_id = ?
+    """, values)
+    return cursor.rowcount > 0
 
 
 # ============================================================================
@@ -173,23 +304,24 @@ def create_session(campaign_id: str, game_id: str, stage_num: int, player_stats:
         player_stats: Dict with score, lives, bombs, power, time_sec
         
     Returns:
-        session_id: UUID of created session
+        session_id: ID of created session
     """
-    session_id = str(uuid.uuid4())
-    stats_json = json.dumps(player_stats)
-    
-    conn = get_connection()
+    with transaction() as conn:
+        return _create_session(conn, campaign_id, game_id, stage_num, player_stats)
+
+
+def _create_session(conn: sqlite3.Connection, campaign_id: str, game_id: str, stage_num: int, player_stats: Dict) -> str:
+    """Insert a game session on an open connection (no commit)"""
+    # Bound as text (not bytes) so the TEXT column holds TEXT values
+    stats_json = orjson.dumps(player_stats).decode()
     
-    try:
-        conn.execute("""
-            INSERT INTO game_sessions 
-            (session_id, campaign_id, game_id, stage_num, player_stats, score)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (session_id, campaign_id, game_id, stage_num, stats_json, player_stats.get('score', 0)))
-        conn.commit()
-        return session_id
-    finally:
-        conn.close()
+    row = conn.execute("""
+        INSERT INTO game_sessions 
+        (session_id, campaign_id, game_id, stage_num, player_stats, score)
+        VALUES (lower(hex(randomblob(16))), ?, ?, ?, ?, ?)
+        RETURNING session_id
+    """, (campaign_id, game_id, stage_num, stats_json, player_stats.get('score', 0))).fetchone()
+    return row['session_id']
 
 
 def complete_session(session_id: str, final_stats: Dict) -> bool:
@@ -203,23 +335,23 @@ def complete_session(session_id: str, final_stats: Dict) -> bool:
     Returns:
         True if updated
     """
-    stats_json = json.dumps(final_stats)
-    
-    conn = get_connection()
+    with transaction() as conn:
+        return _complete_session(conn, session_id, final_stats)
+
+
+def _complete_session(conn: sqlite3.Connection, session_id: str, final_stats: Dict) -> bool:
+    """Mark a session completed on an open connection (no commit)"""
+    stats_json = orjson.dumps(final_stats).decode()
     
-    try:
-        cursor = conn.execute("""
-            UPDATE game_sessions
-            SET completed = 1,
-                completion_time = ?,
-                player_stats = ?,
-                score = ?
-            WHERE session_id = ?
-        """, (datetime.now().isoformat(), stats_json, final_stats.get('score', 0), session_id))
-        conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    cursor = conn.execute("""
+        UPDATE game_sessions
+        SET completed = 1,
+            completion_time = CURRENT_TIMESTAMP,
+            player_stats = ?,
+            score = ?
+        WHERE session_id = ?
+    """, (stats_json, final_stats.get('score', 0), session_id))
+    return cursor.rowcount > 0
 
 
 def get_campaign_sessions(campaign_id: str) -> List[Dict]:
@@ -232,9 +364,7 @@ def get_campaign_sessions(campaign_id: str) -> List[Dict]:
     Returns:
         List of session dicts
     """
-    conn = get_connection()
-    
-    try:
+    with pool.connection() as conn:
         rows = conn.execute("""
             SELECT * FROM game_sessions
             WHERE campaign_id = ?
@@ -244,21 +374,77 @@ def get_campaign_sessions(campaign_id: str) -> List[Dict]:
         sessions = []
         for row in rows:
             session = dict(row)
-            session['player_stats'] = json.loads(session['player_stats'])
+            session['player_stats'] = orjson.loads(session['player_stats'])
             sessions.append(session)
         
         return sessions
-    finally:
-        conn.close()
+
+
+def iter_campaign_sessions(campaign_id: str, batch_size: int = 100) -> Iterator[Dict]:
+    """
+    Stream sessions for a campaign, newest first
+    
+    The query runs and its first batch is fetched before this returns, so
+    database errors raise here rather than partway through a response.
+    Later rows are fetched batch_size at a time on a dedicated (non-pooled)
+    connection, closed once the iterator is exhausted or closed, so a slow
+    client never ties up the pool.
+    
+    Args:
+        campaign_id: Campaign UUID
+        batch_size: Rows fetched per step
+        
+    Returns:
+        Iterator of session dicts; player_stats is left as the stored JSON text
+    """
+    sessions = _iter_campaign_sessions(campaign_id, batch_size)
+    # Run the generator up to its first fetch (it releases the connection
+    # itself if that raises)
+    next(sessions)
+    return sessions
+
+
+def _iter_campaign_sessions(campaign_id: str, batch_size: int) -> Iterator[Optional[Dict]]:
+    """Generator behind iter_campaign_sessions; yields None once the first batch is in"""
+    with pool.dedicated_connection() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM game_sessions
+            WHERE campaign_id = ?
+            ORDER BY created_at DESC
+        """, (campaign_id,))
+        
+        rows = cursor.fetchmany(batch_size)
+        yield None
+        
+        while rows:
+            for row in rows:
+                yield dict(row)
+            rows = cursor.fetchmany(batch_size)
 
 
 # ============================================================================
 # COMPLETED STAGES (SHARED WORLDS)
 # ============================================================================
 
+def _dump_game_data(game_data: Union[GameData, Dict]) -> Tuple[Optional[str], str]:
+    """
+    Serialize game data for storage
+    
+    Validated GameData models are trusted and serialized directly with
+    pydantic's serializer; plain dicts go through orjson. Either way the
+    payload is a str, so it is stored with TEXT affinity like older rows.
+    
+    Returns:
+        Tuple of (game_id or None, JSON payload)
+    """
+    if isinstance(game_data, GameData):
+        return game_data.game_id, game_data.model_dump_json()
+    return game_data.get('game_id'), orjson.dumps(game_data).decode()
+
+
 def save_completed_stage(
     creator_player_id: str,
-    game_data: Dict,
+    game_data: Union[GameData, Dict],
     player_prompt: str,
     difficulty: str = 'normal'
 ) -> str:
@@ -267,28 +453,78 @@ def save_completed_stage(
     
     Args:
         creator_player_id: Player who created this stage
-        game_data: Full game_data dict from LLM
+        game_data: Validated GameData or full game_data dict from LLM
         player_prompt: Original user prompt
         difficulty: Difficulty level
         
     Returns:
-        stage_id: UUID of saved stage
+        stage_id: ID of saved stage
     """
-    stage_id = game_data.get('game_id', str(uuid.uuid4()))
-    game_data_json = json.dumps(game_data)
+    with transaction() as conn:
+        return _save_completed_stage(conn, creator_player_id, game_data, player_prompt, difficulty)
+
+
+def _save_completed_stage(
+    conn: sqlite3.Connection,
+    creator_player_id: str,
+    game_data: Union[GameData, Dict],
+    player_prompt: str,
+    difficulty: str = 'normal'
+) -> str:
+    """Insert a completed stage on an open connection (no commit)"""
+    game_id, game_data_json = _dump_game_data(game_data)
     
-    conn = get_connection()
+    # Reuse the game_id when present, otherwise let SQLite generate one
+    row = conn.execute("""
+        INSERT OR REPLACE INTO completed_stages
+        (stage_id, creator_player_id, game_data, player_prompt, difficulty)
+        VALUES (COALESCE(?, lower(hex(randomblob(16)))), ?, ?, ?, ?)
+        RETURNING stage_id
+    """, (game_id, creator_player_id, game_data_json, player_prompt, difficulty)).fetchone()
+    return row['stage_id']
+
+
+def save_completed_stages_bulk(
+    creator_player_id: str,
+    game_datas: List[Union[GameData, Dict]],
+    player_prompts: List[str],
+    difficulties: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Save several completed stages to the shared world pool in one transaction
     
-    try:
-        conn.execute("""
+    Args:
+        creator_player_id: Player who created these stages
+        game_datas: Validated GameData models or full game_data dicts
+        player_prompts: Original user prompt for each stage
+        difficulties: Difficulty level for each stage (default: normal)
+        
+    Returns:
+        List of stage IDs, in input order
+    """
+    if difficulties is None:
+        difficulties = ['normal'] * len(game_datas)
+    
+    dumped = [_dump_game_data(game_data) for game_data in game_datas]
+    
+    # executemany cannot use RETURNING, so missing IDs are generated here
+    # in the same 32-hex format SQLite produces
+    stage_ids = [game_id or os.urandom(16).hex() for game_id, _ in dumped]
+    
+    rows = (
+        (stage_id, creator_player_id, game_data_json, player_prompt, difficulty)
+        for stage_id, (_, game_data_json), player_prompt, difficulty
+        in zip(stage_ids, dumped, player_prompts, difficulties)
+    )
+    
+    with transaction() as conn:
+        conn.executemany("""
             INSERT OR REPLACE INTO completed_stages
             (stage_id, creator_player_id, game_data, player_prompt, difficulty)
             VALUES (?, ?, ?, ?, ?)
-        """, (stage_id, creator_player_id, game_data_json, player_prompt, difficulty))
-        conn.commit()
-        return stage_id
-    finally:
-        conn.close()
+        """, rows)
+    
+    return stage_ids
 
 
 def get_random_stage(exclude_player_id: Optional[str] = None, difficulty: Optional[str] = None) -> Optional[Dict]:
@@ -302,10 +538,36 @@ def get_random_stage(exclude_player_id: Optional[str] = None, difficulty: Option
     Returns:
         Stage dict with game_data, or None if no stages available
     """
-    conn = get_connection()
+    stages = get_random_stages(exclude_player_id, difficulty, limit=1)
+    if not stages:
+        return None
     
-    try:
-        query = "SELECT * FROM completed_stages WHERE 1=1"
+    stage = stages[0]
+    stage['game_data'] = orjson.loads(stage['game_data'])
+    return stage
+
+
+def get_random_stages(
+    exclude_player_id: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    limit: int = 25
+) -> List[Dict]:
+    """
+    Get a batch of random completed stages from shared world pool
+    
+    Args:
+        exclude_player_id: Exclude stages from this player
+        difficulty: Filter by difficulty (optional)
+        limit: Maximum number of stages to return
+        
+    Returns:
+        List of stage dicts; game_data is left as the stored JSON text
+    """
+    if limit <= 0:
+        return []
+    
+    with pool.connection() as conn:
+        query = "SELECT stage_id FROM completed_stages WHERE 1=1"
         params = []
         
         if exclude_player_id:
@@ -316,17 +578,45 @@ def get_random_stage(exclude_player_id: Optional[str] = None, difficulty: Option
             query += " AND difficulty = ?"
             params.append(difficulty)
         
-        query += " ORDER BY RANDOM() LIMIT 1"
+        # Sample random rowids and walk the rowid B-tree to the next match,
+        # instead of ORDER BY RANDOM() which scores and sorts every row. Each
+        # pick is an index seek; duplicates are dropped, so small pools just
+        # return fewer stages once the attempts run out
+        bounds = conn.execute("""
+            SELECT MIN(rowid) AS lo, MAX(rowid) AS hi FROM completed_stages
+        """).fetchone()
         
-        row = conn.execute(query, params).fetchone()
+        if bounds['lo'] is None:
+            return []
         
-        if row:
-            stage = dict(row)
-            stage['game_data'] = json.loads(stage['game_data'])
-            return stage
-        return None
-    finally:
-        conn.close()
+        stage_ids = []
+        for _ in range(limit * 2):
+            pivot = random.randint(bounds['lo'], bounds['hi'])
+            row = conn.execute(
+                query + " AND rowid >= ? ORDER BY rowid LIMIT 1",
+                params + [pivot]
+            ).fetchone()
+            
+            # Wrap around to the lowest matching rowid
+            if not row:
+                row = conn.execute(query + " ORDER BY rowid LIMIT 1", params).fetchone()
+                if not row:
+                    return []
+            
+            if row['stage_id'] not in stage_ids:
+                stage_ids.append(row['stage_id'])
+                if len(stage_ids) == limit:
+                    break
+        
+        placeholders = ",".join("?" * len(stage_ids))
+        rows = conn.execute(
+            f"SELECT * FROM completed_stages WHERE stage_id IN ({placeholders})",
+            stage_ids
+        ).fetchall()
+        
+        # Keep the sampled (random) order
+        by_id = {row['stage_id']: dict(row) for row in rows}
+        return [by_id[stage_id] for stage_id in stage_ids]
 
 
 def increment_stage_plays(stage_id: str, score: int):
@@ -337,32 +627,33 @@ def increment_stage_plays(stage_id: str, score: int):
         stage_id: Stage UUID
         score: Player's score on this playthrough
     """
-    conn = get_connection()
+    with pool.connection() as conn:
+        # Single UPDATE: the SET list sees pre-increment column values,
+        # so the running average is computed atomically in SQLite
+        conn.execute("""
+            UPDATE completed_stages
+            SET average_score = ((average_score * times_played) + ?) / (times_played + 1),
+                times_played = times_played + 1
+            WHERE stage_id = ?
+        """, (score, stage_id))
+        conn.commit()
+
+
+def increment_stage_plays_bulk(plays: Dict[str, int]):
+    """
+    Record several unscored plays per stage in one transaction
     
-    try:
-        # Get current stats
-        row = conn.execute("""
-            SELECT times_played, average_score FROM completed_stages
+    Args:
+        plays: Number of plays to add, keyed by stage UUID; each counts as a
+            score of 0 in the running average, like increment_stage_plays
+    """
+    with transaction() as conn:
+        conn.executemany("""
+            UPDATE completed_stages
+            SET average_score = (average_score * times_played) / (times_played + ?),
+                times_played = times_played + ?
             WHERE stage_id = ?
-        """, (stage_id,)).fetchone()
-        
-        if row:
-            times_played = row['times_played']
-            avg_score = row['average_score']
-            
-            # Calculate new average
-            new_times_played = times_played + 1
-            new_avg_score = ((avg_score * times_played) + score) // new_times_played
-            
-            conn.execute("""
-                UPDATE completed_stages
-                SET times_played = ?,
-                    average_score = ?
-                WHERE stage_id = ?
-            """, (new_times_played, new_avg_score, stage_id))
-            conn.commit()
-    finally:
-        conn.close()
+        """, ((count, count, stage_id) for stage_id, count in plays.items()))
 
 
 def get_stage_stats(stage_id: str) -> Optional[Dict]:
@@ -375,9 +666,7 @@ def get_stage_stats(stage_id: str) -> Optional[Dict]:
     Returns:
         Dict with times_played, average_score, etc.
     """
-    conn = get_connection()
-    
-    try:
+    with pool.connection() as conn:
         row = conn.execute("""
             SELECT stage_id, creator_player_id, player_prompt, difficulty,
                    times_played, average_score, created_at
@@ -388,8 +677,6 @@ def get_stage_stats(stage_id: str) -> Optional[Dict]:
         if row:
             return dict(row)
         return None
-    finally:
-        conn.close()
 
 
 # ============================================================================
@@ -398,23 +685,25 @@ def get_stage_stats(stage_id: str) -> Optional[Dict]:
 
 def get_database_stats() -> Dict:
     """Get database statistics"""
-    conn = get_connection()
-    
-    try:
-        campaigns_count = conn.execute("SELECT COUNT(*) as count FROM campaigns").fetchone()['count']
-        sessions_count = conn.execute("SELECT COUNT(*) as count FROM game_sessions").fetchone()['count']
-        stages_count = conn.execute("SELECT COUNT(*) as count FROM completed_stages").fetchone()['count']
+    with pool.connection() as conn:
+        row = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM campaigns) AS campaigns,
+                (SELECT COUNT(*) FROM game_sessions) AS sessions,
+                (SELECT COUNT(*) FROM completed_stages) AS completed_stages
+        """).fetchone()
         
         return {
-            "campaigns": campaigns_count,
-            "sessions": sessions_count,
-            "completed_stages": stages_count,
+            "campaigns": row['campaigns'],
+            "sessions": row['sessions'],
+            "completed_stages": row['completed_stages'],
             "database_path": str(DB_PATH)
         }
-    finally:
-        conn.close()
 
 
-# Initialize database on module import
-if not DB_PATH.exists():
-    init_database()
+# Initialize database on module import (schema is idempotent, so existing
+# files also pick up new indexes)
+init_database()
+
+# Pre-warm pooled connections
+pool.warm()
@@ -14,8 +14,17 @@ from .game_data import (
     TUISkin,
     CRTEffects,
     ParallaxLayer,
+    HexColor,
+    parse_game_data,
     SAMPLE_GAME_DATA
 )
+from .requests import (
+    GenerateGameRequest,
+    GenerateSpritesRequest,
+    GenerateTexturesRequest,
+    SaveGameRequest,
+    PlayerStats
+)
 
 __all__ = [
     'GameData',
@@ -32,5 +41,12 @@ __all__ = [
     'TUISkin',
     'CRTEffects',
     'ParallaxLayer',
-    'SAMPLE_GAME_DATA'
+    'HexColor',
+    'parse_game_data',
+    'SAMPLE_GAME_DATA',
+    'GenerateGameRequest',
+    'GenerateSpritesRequest',
+    'GenerateTexturesRequest',
+    'SaveGameRequest',
+    'PlayerStats'
 ]
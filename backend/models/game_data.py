@@ -2,17 +2,21 @@
 Pydantic models for Fantasy OS SHMUP game data validation
 Based on GDD JSON schema
 """
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Annotated
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, field_validator, model_validator
 import uuid
 
 
+# Shared hex color type (#RRGGBB); the pattern is compiled once for all fields
+HexColor = Annotated[str, Field(pattern=r"^#[0-9A-Fa-f]{6}$")]
+
+
 # Story and theming models
 class Palette(BaseModel):
     """ANSI color palette for TUI rendering"""
-    ansi_fg: str = Field(..., description="Foreground color (hex)", pattern=r"^#[0-9A-Fa-f]{6}$")
-    ansi_bg: str = Field(..., description="Background color (hex)", pattern=r"^#[0-9A-Fa-f]{6}$")
-    accent: str = Field(..., description="Accent color (hex)", pattern=r"^#[0-9A-Fa-f]{6}$")
+    ansi_fg: HexColor = Field(..., description="Foreground color (hex)")
+    ansi_bg: HexColor = Field(..., description="Background color (hex)")
+    accent: HexColor = Field(..., description="Accent color (hex)")
 
 
 class Story(BaseModel):
@@ -167,6 +171,9 @@ class GameData(BaseModel):
     tui_skin: Optional[TUISkin] = Field(None, description="TUI skin configuration (optional)")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
     
+    # Summary counts, collected once when the model is validated
+    _summary: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    
     @field_validator('stages')
     @classmethod
     def validate_stages(cls, v: List[Stage]) -> List[Stage]:
@@ -193,6 +200,42 @@ class GameData(BaseModel):
         if len(ids) != len(set(ids)):
             raise ValueError("Bullet pattern IDs must be unique")
         return v
+    
+    @model_validator(mode='after')
+    def collect_summary(self) -> 'GameData':
+        """Record summary statistics while the validated tree is at hand"""
+        total_waves = 0
+        total_boss_phases = 0
+        for stage in self.stages:
+            total_waves += len(stage.waves)
+            total_boss_phases += len(stage.boss.phases)
+        
+        self._summary = {
+            "game_id": self.game_id,
+            "os_name": self.story.os_name,
+            "stage_count": len(self.stages),
+            "enemy_count": len(self.enemies),
+            "pattern_count": len(self.bullet_patterns) if self.bullet_patterns else 0,
+            "weapon_count": len(self.weapons),
+            "pickup_count": len(self.pickups),
+            "total_waves": total_waves,
+            "total_boss_phases": total_boss_phases,
+            "glyph_bullets": self.tui_skin.glyph_bullets if self.tui_skin else False
+        }
+        return self
+    
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """Summary statistics collected during validation"""
+        # Models built without validation (model_construct) collect them now
+        if self._summary is None:
+            self.collect_summary()
+        return self._summary
+
+
+# Module-level adapter so the GameData core schema is built once
+_game_data_adapter = TypeAdapter(GameData)
+parse_game_data = _game_data_adapter.validate_python
 
 
 # Sample data for testing
@@ -0,0 +1,103 @@
+"""
+Pydantic models for API request bodies
+"""
+from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class RequestModel(BaseModel):
+    """Base for request bodies: unknown keys are ignored, strings are stripped"""
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True)
+    
+    @model_validator(mode='before')
+    @classmethod
+    def null_means_default(cls, data: Any) -> Any:
+        """
+        Treat an explicit null like a missing key for fields with a default
+        
+        Clients sent e.g. "color": null before these models existed and got
+        the default; keep accepting that instead of answering 400.
+        """
+        if not isinstance(data, dict):
+            return data
+        return {
+            key: value for key, value in data.items()
+            if value is not None or key not in cls.model_fields or cls.model_fields[key].is_required()
+        }
+
+
+# /api/generate-game
+class GenerateGameRequest(RequestModel):
+    """Game generation request"""
+    user_prompt: str = Field(..., min_length=10)
+    difficulty: Literal['easy', 'normal', 'hard'] = 'normal'
+    player_id: Optional[str] = None
+
+
+# /api/generate-sprites
+class SpriteRequest(RequestModel):
+    """Single sprite to generate (missing prompts are reported per entry)"""
+    id: Optional[str] = None
+    sprite_prompt: Optional[str] = None
+
+
+class GenerateSpritesRequest(RequestModel):
+    """Sprite generation request"""
+    game_id: Optional[str] = None
+    color: str = '#00FFD1'
+    player: Optional[SpriteRequest] = None
+    enemies: List[SpriteRequest] = Field(default_factory=list)
+    bosses: List[SpriteRequest] = Field(default_factory=list)
+
+
+# /api/generate-textures
+class TextureLayerRequest(RequestModel):
+    """Single parallax layer to generate"""
+    id: Optional[str] = None
+    prompt: Optional[str] = None
+    depth: float = 0.5
+
+
+class TUIFrameRequest(RequestModel):
+    """Single TUI frame to generate (missing prompts are reported per entry)"""
+    id: Optional[str] = None
+    prompt: Optional[str] = None
+
+
+class GenerateTexturesRequest(RequestModel):
+    """Texture generation request"""
+    game_id: Optional[str] = None
+    theme: str = ''
+    color: str = '#00FFD1'
+    parallax_layers: List[TextureLayerRequest] = Field(default_factory=list)
+    tui_frame_prompt: Optional[str] = None
+    tui_frames: List[TUIFrameRequest] = Field(default_factory=list)
+
+
+# /api/save-game
+class PlayerStats(RequestModel):
+    """
+    Player stats snapshot
+    
+    Only the stats copied onto the campaign are typed; everything else
+    (time_sec, ...) is kept exactly as sent for the session record.
+    """
+    model_config = ConfigDict(extra='allow')
+    
+    score: int = 0
+    lives: int = 3
+    bombs: int = 3
+    power: int = 1
+
+
+class SaveGameRequest(RequestModel):
+    """Campaign progress save request"""
+    player_id: str = Field(..., min_length=1)
+    campaign_id: Optional[str] = None
+    game_id: str = Field(..., min_length=1)
+    stage_num: int = 0
+    player_stats: PlayerStats = Field(default_factory=PlayerStats)
+    completed: bool = False
+    game_data: Optional[Dict[str, Any]] = None
+    player_prompt: Optional[str] = None
+    difficulty: str = 'normal'
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pre-generate games for common prompts so first requests hit the LLM cache
+
+Usage:
+    python prewarm.py [themes.txt] [--difficulty normal] [--concurrency 8]
+
+Reads one prompt per line (blank lines and # comments ignored) and fills
+cache/llm (and the semantic index, if enabled) for every prompt that is not
+cached yet. The cache is keyed on the exact prompt /api/generate-game
+receives, so lines are validated like a request and rejected lines are
+skipped. Bumping PROMPT_VERSION in services/llm_service.py invalidates
+the prewarmed games; rerun this script afterwards.
+"""
+import sys
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from pydantic import ValidationError
+from models.requests import GenerateGameRequest
+from services.llm_service import generate_games_batch, get_llm_cache_key, load_from_llm_cache
+
+DEFAULT_THEMES_FILE = Path(__file__).parent / 'themes.txt'
+
+
+def read_themes(path: Path) -> list:
+    """
+    Read unique prompts from a text file, in order
+    
+    Each line goes through GenerateGameRequest so the returned prompt is the
+    string the endpoint would cache under; lines it rejects are skipped.
+    """
+    themes = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            theme = GenerateGameRequest(user_prompt=line).user_prompt
+        except ValidationError:
+            print(f"⚠️  Skipping {line.strip()!r}: not a valid /api/generate-game prompt")
+            continue
+        if theme not in themes:
+            themes.append(theme)
+    return themes
+
+
+def main() -> int:
+    """Generate and cache a game for every uncached theme"""
+    parser = argparse.ArgumentParser(description="Prewarm the LLM game cache")
+    parser.add_argument('themes_file', nargs='?', type=Path, default=DEFAULT_THEMES_FILE)
+    parser.add_argument('--difficulty', default='normal', choices=['easy', 'normal', 'hard'])
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    themes = read_themes(args.themes_file)
+    missing = [theme for theme in themes if load_from_llm_cache(get_llm_cache_key(theme)) is None]
+    print(f"🔥 {len(themes)} themes, {len(themes) - len(missing)} already cached, generating {len(missing)}")
+    
+    if not missing:
+        return 0
+    
+    results = asyncio.run(generate_games_batch(missing, args.difficulty, args.concurrency))
+    
+    failed = 0
+    for theme, (success, _, error) in zip(missing, results):
+        if not success:
+            failed += 1
+            print(f"❌ {theme}: {error}")
+    
+    print(f"✅ Cached {len(missing) - failed}/{len(missing)} themes")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Batch endpoint
+Handles /api/batch - runs several API calls in one round trip
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.test import EnvironBuilder
+
+batch_bp = Blueprint('batch', __name__)
+
+# Upper bounds for a single batch request
+MAX_BATCH_REQUESTS = 16
+MAX_BATCH_WORKERS = 8
+
+# Headers describing the batch body itself; each sub-request sets its own
+BATCH_BODY_HEADERS = {'content-length', 'content-type'}
+
+
+def parse_batch_item(item):
+    """
+    Normalize a batch entry into (key, method, path, body)
+    
+    Accepts either a path string (GET) or an object with "path",
+    optional "method" (default GET), "body", and "id" (result key).
+    """
+    if isinstance(item, str):
+        return item, 'GET', item, None
+    if isinstance(item, dict) and isinstance(item.get('path'), str):
+        key = item.get('id', item['path'])
+        method = item.get('method', 'GET')
+        # Keys must be hashable and methods strings; anything else is a bad entry
+        if isinstance(key, str) and isinstance(method, str):
+            return key, method.upper(), item['path'], item.get('body')
+    return None, None, None, None
+
+
+def dispatch_batch_item(app, method, path, body, headers, base_url, remote_addr):
+    """
+    Run a single sub-request through the app's own dispatch and capture its result
+    
+    The sub-request gets a request context of its own carrying the batch
+    request's headers (cookies included), host and remote address, so views
+    and before/after-request hooks see the same client. Server-Sent Event
+    responses can't be folded into one JSON body and are rejected.
+    """
+    builder = EnvironBuilder(
+        path=path,
+        base_url=base_url,
+        method=method,
+        headers=headers,
+        json=body,
+        environ_base={'REMOTE_ADDR': remote_addr}
+    )
+    
+    with app.request_context(builder.get_environ()):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = app.handle_exception(e)
+        
+        try:
+            if response.mimetype == 'text/event-stream':
+                return {
+                    "status": 400,
+                    "body": {"error": f"Streaming responses are not supported in a batch: {path}"}
+                }
+            
+            return {
+                "status": response.status_code,
+                "body": response.get_json(silent=True)
+            }
+        finally:
+            response.close()
+
+
+@batch_bp.route('/batch', methods=['POST'])
+def batch():
+    """
+    Execute several API requests in one call
+    
+    Request body:
+        [
+            "/api/get-next-stage?player_id=abc",
+            {"id": "sprites", "method": "POST", "path": "/api/generate-sprites", "body": {...}}
+        ]
+    
+    Returns:
+        Results keyed by id (or path): {key: {"status": int, "body": dict}}
+    """
+    items = request.get_json()
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Request body must be a non-empty list of requests"}), 400
+    
+    if len(items) > MAX_BATCH_REQUESTS:
+        return jsonify({"error": f"Batch is limited to {MAX_BATCH_REQUESTS} requests"}), 400
+    
+    parsed = [parse_batch_item(item) for item in items]
+    for item, (_, _, path, _) in zip(items, parsed):
+        if path is None:
+            return jsonify({"error": f"Invalid batch entry: {item!r}"}), 400
+        if not path or not path.startswith('/api/') or path.startswith('/api/batch'):
+            return jsonify({"error": f"Invalid batch path: {path}"}), 400
+        if parse_qs(urlsplit(path).query).get('stream') == ['1']:
+            return jsonify({"error": f"Streaming responses are not supported in a batch: {path}"}), 400
+    
+    if len({key for key, _, _, _ in parsed}) != len(parsed):
+        return jsonify({"error": "Batch entries must have unique ids or paths"}), 400
+    
+    app = current_app._get_current_object()
+    
+    # Forwarded to every sub-request (the request proxy isn't usable from
+    # the worker threads)
+    headers = [
+        (name, value) for name, value in request.headers
+        if name.lower() not in BATCH_BODY_HEADERS
+    ]
+    base_url = request.host_url
+    remote_addr = request.remote_addr
+    
+    # Sub-requests are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(parsed))) as executor:
+        futures = [
+            executor.submit(dispatch_batch_item, app, method, path, body, headers, base_url, remote_addr)
+            for _, method, path, body in parsed
+        ]
+        results = {
+            key: future.result()
+            for (key, _, _, _), future in zip(parsed, futures)
+        }
+    
+    return jsonify(results), 200
@@ -2,9 +2,17 @@
 Game generation endpoint
 Handles /api/generate-game
 """
-from flask import Blueprint, request, jsonify
-from services.llm_service import generate_game_json
-from utils.validation import validate_game_data, get_validation_summary
+import os
+import hashlib
+import logging
+import orjson
+from flask import Blueprint, Response, current_app, request, jsonify
+from pydantic import ValidationError
+from models.requests import GenerateGameRequest
+from services.llm_service import generate_game_json_coalesced
+from utils.validation import validate_game_data, get_validation_summary, format_validation_error, dump_game_json
+
+logger = logging.getLogger(__name__)
 
 game_bp = Blueprint('game', __name__)
 
@@ -24,70 +32,76 @@ def generate_game():
         Game data JSON with stages, enemies, patterns, etc.
     """
     try:
-        data = request.get_json()
+        data = request.get_data(cache=False)
         
         # Validate request
-        if not data or 'user_prompt' not in data:
+        if not data:
             return jsonify({
                 "error": "Missing required field: user_prompt"
             }), 400
         
-        user_prompt = data.get('user_prompt', '').strip()
-        if not user_prompt or len(user_prompt) < 10:
-            return jsonify({
-                "error": "user_prompt must be at least 10 characters"
-            }), 400
-        
-        difficulty = data.get('difficulty', 'normal')
-        if difficulty not in ['easy', 'normal', 'hard']:
+        try:
+            req = GenerateGameRequest.model_validate_json(data)
+        except ValidationError as e:
             return jsonify({
-                "error": "difficulty must be one of: easy, normal, hard"
+                "error": format_validation_error(e)
             }), 400
         
-        player_id = data.get('player_id')
+        user_prompt = req.user_prompt
+        difficulty = req.difficulty
+        player_id = req.player_id
         
         # Generate game JSON using LLM
-        print(f"📝 Generating game for prompt: {user_prompt[:50]}...")
-        success, game_data, error = generate_game_json(user_prompt, difficulty)
+        logger.info(f"📝 Generating game for prompt: {user_prompt[:50]}...")
+        success, game_data, error = generate_game_json_coalesced(user_prompt, difficulty)
         
         if not success:
-            print(f"❌ LLM generation failed: {error}")
+            logger.error(f"❌ LLM generation failed: {error}")
             return jsonify({
                 "error": "Failed to generate game",
                 "details": error
             }), 500
         
-        print(f"✅ LLM generated game data, validating...")
+        logger.info("✅ LLM generated game data, validating...")
         
         # Validate generated data
         try:
             is_valid, validated_game, validation_error = validate_game_data(game_data)
         except Exception as validation_exception:
-            print(f"❌ Validation crashed: {type(validation_exception).__name__}: {str(validation_exception)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Validation crashed: {type(validation_exception).__name__}: {str(validation_exception)}")
             return jsonify({
                 "error": "Validation error",
                 "details": f"{type(validation_exception).__name__}: {str(validation_exception)}"
             }), 500
         
         if not is_valid:
-            print(f"❌ Validation failed: {validation_error}")
-            return jsonify({
+            logger.warning(f"❌ Validation failed: {validation_error}")
+            response = {
                 "error": "Generated game data failed validation",
-                "details": validation_error,
-                "raw_data": game_data  # Include for debugging
-            }), 500
+                "details": validation_error
+            }
+            
+            if current_app.debug or os.getenv('INCLUDE_RAW_DATA') == '1':
+                response["raw_data"] = game_data  # Include for debugging
+            else:
+                # Log the raw output once and return a hash to correlate with it
+                raw_json = orjson.dumps(game_data)
+                raw_data_hash = hashlib.blake2b(raw_json).hexdigest()[:12]
+                logger.warning(f"Raw game data {raw_data_hash}: {raw_json.decode()}")
+                response["raw_data_hash"] = raw_data_hash
+            
+            return jsonify(response), 500
         
-        print(f"✅ Validation passed")
+        logger.info("✅ Validation passed")
         
         # Get summary statistics
         summary = get_validation_summary(validated_game)
         
-        # Return validated game data
+        # Return validated game data; the game is serialized once by
+        # pydantic-core and embedded as-is instead of round-tripping through a dict
         response = {
             "success": True,
-            "game_data": validated_game.model_dump(),
+            "game_data": orjson.Fragment(dump_game_json(validated_game, exclude_none=True)),
             "summary": summary,
             "metadata": {
                 "user_prompt": user_prompt,
@@ -96,13 +110,11 @@ def generate_game():
             }
         }
         
-        return jsonify(response), 200
+        return Response(orjson.dumps(response), status=200, mimetype='application/json')
         
     except Exception as e:
         # Catch any unexpected errors
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"❌ Unexpected error in /generate-game: {error_details}")
+        logger.exception("❌ Unexpected error in /generate-game")
         
         return jsonify({
             "error": "Internal server error",
@@ -2,13 +2,183 @@
 Shared world and persistence endpoints
 Handles /api/save-game, /api/load-game, /api/get-next-stage, /api/patch-story
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+from pydantic import ValidationError
+from models.requests import SaveGameRequest
+from utils.validation import format_validation_error
+from services.llm_service import TEXT_MODEL
 import database
 import litellm
+import logging
+import orjson
 import os
+import time
+import hashlib
+import atexit
+import threading
+from collections import Counter, OrderedDict
+
+logger = logging.getLogger(__name__)
 
 shared_bp = Blueprint('shared', __name__)
 
+# Fixed instructions for /patch-story, sent ahead of the per-request stage
+# details so every call shares the same cacheable prompt prefix
+STORY_SYSTEM_PROMPT = """You are a narrative designer for a biomechanical shmup game.
+Write a 2-3 sentence transition between two stages.
+Write a brief, atmospheric transition that connects these two worlds.
+Use biomechanical, Giger-inspired imagery. Keep it under 50 words.
+Return only the narrative text, no additional formatting."""
+
+
+# Generated bridges, LRU-evicted and expired after CACHE_TTL_STORIES_SEC
+STORY_CACHE_TTL = int(os.getenv('CACHE_TTL_STORIES_SEC', '3600'))
+STORY_CACHE_MAX = 2048
+STORY_CACHE = OrderedDict()
+_story_cache_lock = threading.Lock()
+
+
+def get_story_cache_key(model, prev_os, prev_tagline, next_os, next_tagline):
+    """Generate cache key from the model and both stages"""
+    key_str = f"{model}|{prev_os}|{prev_tagline}|{next_os}|{next_tagline}"
+    return hashlib.sha1(key_str.encode()).hexdigest()
+
+
+def load_cached_bridge(cache_key):
+    """Return a cached bridge if present and not expired"""
+    with _story_cache_lock:
+        entry = STORY_CACHE.get(cache_key)
+        if not entry:
+            return None
+        
+        expires_at, bridge_text = entry
+        if expires_at < time.monotonic():
+            del STORY_CACHE[cache_key]
+            return None
+        
+        STORY_CACHE.move_to_end(cache_key)
+        return bridge_text
+
+
+def save_cached_bridge(cache_key, bridge_text):
+    """Store a bridge, evicting the least recently used entry when full"""
+    with _story_cache_lock:
+        STORY_CACHE[cache_key] = (time.monotonic() + STORY_CACHE_TTL, bridge_text)
+        STORY_CACHE.move_to_end(cache_key)
+        if len(STORY_CACHE) > STORY_CACHE_MAX:
+            STORY_CACHE.popitem(last=False)
+
+
+# Random stage candidates per (player_id, difficulty), popped one per
+# /get-next-stage call and refilled with a single query when empty or stale.
+# Pooled rows only pick the stage; its play stats are re-read when served
+STAGE_POOL_TTL = 30
+STAGE_POOL_SIZE = 25
+STAGE_POOL_MAX = 512
+STAGE_POOL = OrderedDict()
+_stage_pool_lock = threading.Lock()
+
+# Play counts are bookkeeping: they are tallied per stage in memory and
+# written in one transaction every PLAY_COUNT_FLUSH_SEC (and at exit), so
+# served stats can lag by up to one interval
+PLAY_COUNT_FLUSH_SEC = 5
+_pending_plays = Counter()
+_pending_plays_lock = threading.Lock()
+_play_flusher = None
+
+
+def flush_stage_plays():
+    """Write the tallied play counts to the database"""
+    with _pending_plays_lock:
+        plays = dict(_pending_plays)
+        _pending_plays.clear()
+    
+    if not plays:
+        return
+    
+    try:
+        database.increment_stage_plays_bulk(plays)
+    except Exception:
+        logger.exception(f"⚠️  Failed to record {sum(plays.values())} plays for {len(plays)} stages")
+
+
+def _flush_stage_plays_forever():
+    """Background loop for flush_stage_plays"""
+    while True:
+        time.sleep(PLAY_COUNT_FLUSH_SEC)
+        flush_stage_plays()
+
+
+def record_stage_play(stage_id):
+    """Count one play of a stage; the flusher thread starts on first use"""
+    global _play_flusher
+    
+    with _pending_plays_lock:
+        _pending_plays[stage_id] += 1
+        if _play_flusher is None:
+            _play_flusher = threading.Thread(target=_flush_stage_plays_forever, daemon=True)
+            _play_flusher.start()
+
+
+atexit.register(flush_stage_plays)
+
+
+def pop_pooled_stage(player_id, difficulty):
+    """Take the next random stage for this player/difficulty, refilling the pool if needed"""
+    key = (player_id, difficulty)
+    
+    with _stage_pool_lock:
+        entry = STAGE_POOL.get(key)
+        if entry and entry[0] >= time.monotonic() and entry[1]:
+            STAGE_POOL.move_to_end(key)
+            return entry[1].pop()
+    
+    stages = database.get_random_stages(
+        exclude_player_id=player_id,
+        difficulty=difficulty,
+        limit=STAGE_POOL_SIZE
+    )
+    if not stages:
+        return None
+    
+    stage = stages.pop()
+    with _stage_pool_lock:
+        STAGE_POOL[key] = (time.monotonic() + STAGE_POOL_TTL, stages)
+        STAGE_POOL.move_to_end(key)
+        if len(STAGE_POOL) > STAGE_POOL_MAX:
+            STAGE_POOL.popitem(last=False)
+    return stage
+
+
+def stream_story_bridge(model, messages, prev_os, next_os, cache_key):
+    """
+    Yield a story bridge as Server-Sent Events
+    
+    Each token arrives as {"delta": str}; the stream ends with
+    {"done": true, ...} or {"error": str}.
+    """
+    try:
+        parts = []
+        for chunk in litellm.completion(
+            model=model,
+            messages=messages,
+            temperature=0.8,
+            max_tokens=150,
+            stream=True
+        ):
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+        
+        if parts:
+            save_cached_bridge(cache_key, "".join(parts).strip())
+        
+        yield b"data: " + orjson.dumps({"done": True, "previous_os": prev_os, "next_os": next_os}) + b"\n\n"
+        
+    except Exception as e:
+        yield b"data: " + orjson.dumps({"error": f"Story generation failed: {str(e)}"}) + b"\n\n"
+
 
 @shared_bp.route('/save-game', methods=['POST'])
 def save_game():
@@ -37,68 +207,68 @@ def save_game():
     Returns:
         Campaign and session IDs
     """
-    data = request.get_json()
+    # Parse and validate the raw body in one pass (pydantic's JSON parser)
+    data = request.get_data(cache=False)
     
     if not data:
         return jsonify({"error": "Missing request body"}), 400
     
-    player_id = data.get('player_id')
-    campaign_id = data.get('campaign_id')
-    game_id = data.get('game_id')
-    stage_num = data.get('stage_num', 0)
-    player_stats = data.get('player_stats', {})
-    completed = data.get('completed', False)
+    try:
+        req = SaveGameRequest.model_validate_json(data)
+    except ValidationError as e:
+        return jsonify({"error": format_validation_error(e)}), 400
     
-    if not player_id or not game_id:
-        return jsonify({"error": "Missing player_id or game_id"}), 400
+    player_id = req.player_id
+    campaign_id = req.campaign_id
+    game_id = req.game_id
+    stage_num = req.stage_num
+    stats = req.player_stats
+    # Only the stats the client sent are recorded on the session
+    player_stats = stats.model_dump(exclude_unset=True)
     
     try:
-        # Create or get campaign
-        if not campaign_id:
-            campaign_id = database.create_campaign(player_id)
-        else:
-            # Verify campaign exists
-            campaign = database.get_campaign(campaign_id)
-            if not campaign:
+        # Every write for this save commits (or rolls back) together
+        stage_id = None
+        with database.transaction() as conn:
+            # Create or get campaign
+            if not campaign_id:
+                campaign_id = database._create_campaign(conn, player_id)
+            elif not database._campaign_exists(conn, campaign_id):
                 return jsonify({"error": "Campaign not found"}), 404
-        
-        # Create session
-        session_id = database.create_session(campaign_id, game_id, stage_num, player_stats)
-        
-        # Update campaign stats
-        database.update_campaign(
-            campaign_id,
-            current_stage_num=stage_num,
-            total_score=player_stats.get('score', 0),
-            lives=player_stats.get('lives', 3),
-            bombs=player_stats.get('bombs', 3),
-            power_level=player_stats.get('power', 1)
-        )
-        
-        # If completed, mark session and optionally save to shared world
-        if completed:
-            database.complete_session(session_id, player_stats)
             
-            # Save to shared world if game_data provided
-            game_data = data.get('game_data')
-            player_prompt = data.get('player_prompt')
-            difficulty = data.get('difficulty', 'normal')
+            session_id = database._create_session(conn, campaign_id, game_id, stage_num, player_stats)
             
-            if game_data and player_prompt:
-                stage_id = database.save_completed_stage(
-                    player_id,
-                    game_data,
-                    player_prompt,
-                    difficulty
-                )
+            database._update_campaign(
+                conn,
+                campaign_id,
+                current_stage_num=stage_num,
+                total_score=stats.score,
+                lives=stats.lives,
+                bombs=stats.bombs,
+                power_level=stats.power
+            )
+            
+            if req.completed:
+                database._complete_session(conn, session_id, player_stats)
                 
-                return jsonify({
-                    "success": True,
-                    "campaign_id": campaign_id,
-                    "session_id": session_id,
-                    "stage_id": stage_id,
-                    "message": "Game saved and added to shared world"
-                }), 200
+                # Save to shared world if game_data provided
+                if req.game_data and req.player_prompt:
+                    stage_id = database._save_completed_stage(
+                        conn,
+                        player_id,
+                        req.game_data,
+                        req.player_prompt,
+                        req.difficulty
+                    )
+        
+        if stage_id:
+            return jsonify({
+                "success": True,
+                "campaign_id": campaign_id,
+                "session_id": session_id,
+                "stage_id": stage_id,
+                "message": "Game saved and added to shared world"
+            }), 200
         
         return jsonify({
             "success": True,
@@ -111,6 +281,19 @@ def save_game():
         return jsonify({"error": str(e)}), 500
 
 
+def stream_load_game(campaign, sessions):
+    """Yield the /load-game JSON body, encoding one session at a time"""
+    yield b'{"success":true,"campaign":' + orjson.dumps(campaign) + b',"sessions":['
+    
+    session_count = 0
+    for session in sessions:
+        session['player_stats'] = orjson.Fragment(session['player_stats'])
+        yield (b',' if session_count else b'') + orjson.dumps(session)
+        session_count += 1
+    
+    yield b'],"session_count":' + str(session_count).encode() + b'}'
+
+
 @shared_bp.route('/load-game', methods=['GET'])
 def load_game():
     """
@@ -146,15 +329,10 @@ def load_game():
             campaign = campaigns[0]
             campaign_id = campaign['campaign_id']
         
-        # Get sessions
-        sessions = database.get_campaign_sessions(campaign_id)
-        
-        return jsonify({
-            "success": True,
-            "campaign": campaign,
-            "sessions": sessions,
-            "session_count": len(sessions)
-        }), 200
+        # Stream sessions row by row instead of building the whole payload;
+        # the query runs here so its errors still get the 500 below
+        sessions = database.iter_campaign_sessions(campaign_id)
+        return Response(stream_load_game(campaign, sessions), status=200, mimetype='application/json')
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -176,10 +354,7 @@ def get_next_stage():
     difficulty = request.args.get('difficulty')
     
     try:
-        stage = database.get_random_stage(
-            exclude_player_id=player_id,
-            difficulty=difficulty
-        )
+        stage = pop_pooled_stage(player_id, difficulty)
         
         if not stage:
             return jsonify({
@@ -187,19 +362,22 @@ def get_next_stage():
                 "message": "No stages available in shared world"
             }), 404
         
-        # Increment play count
-        database.increment_stage_plays(stage['stage_id'], 0)
+        record_stage_play(stage['stage_id'])
+        
+        # The pooled row may be up to STAGE_POOL_TTL old; report current stats
+        stats = database.get_stage_stats(stage['stage_id']) or stage
         
+        # game_data is embedded as the stored JSON text, without a parse
         return jsonify({
             "success": True,
             "stage": {
                 "stage_id": stage['stage_id'],
-                "game_data": stage['game_data'],
+                "game_data": orjson.Fragment(stage['game_data']),
                 "player_prompt": stage['player_prompt'],
                 "difficulty": stage['difficulty'],
                 "creator_player_id": stage['creator_player_id'],
-                "times_played": stage['times_played'],
-                "average_score": stage['average_score']
+                "times_played": stats['times_played'],
+                "average_score": stats['average_score']
             }
         }), 200
         
@@ -208,7 +386,7 @@ def get_next_stage():
 
 
 @shared_bp.route('/patch-story', methods=['POST'])
-def patch_story():
+async def patch_story():
     """
     Generate narrative bridge between two stages using Cerebras
     
@@ -224,6 +402,9 @@ def patch_story():
             }
         }
     
+    Query params:
+        stream: "1" to stream the bridge as Server-Sent Events
+    
     Returns:
         2-3 sentence narrative bridge
     """
@@ -245,40 +426,69 @@ def patch_story():
     
     try:
         # Build prompt for narrative bridge
-        prompt = f"""You are a narrative designer for a biomechanical shmup game.
-Write a 2-3 sentence transition between two stages.
-
-Previous stage: {prev_os} - "{prev_tagline}"
+        prompt = f"""Previous stage: {prev_os} - "{prev_tagline}"
 Next stage: {next_os} - "{next_tagline}"
-
-Write a brief, atmospheric transition that connects these two worlds.
-Use biomechanical, Giger-inspired imagery. Keep it under 50 words.
-Return only the narrative text, no additional formatting."""
+"""
+        
+        messages = [
+            {"role": "system", "content": STORY_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
         
         # Call Cerebras LLM
-        model = os.getenv('TEXT_MODEL', 'cerebras/llama-3.3-70b')
+        model = TEXT_MODEL
         
-        print(f"🤖 Generating story bridge with {model}...")
+        stream = request.args.get('stream') == '1'
+        cache_key = get_story_cache_key(model, prev_os, prev_tagline, next_os, next_tagline)
+        bridge_text = load_cached_bridge(cache_key)
         
-        response = litellm.completion(
+        if bridge_text is not None:
+            logger.info("📦 Story bridge cache HIT")
+            if stream:
+                events = [
+                    b"data: " + orjson.dumps({"delta": bridge_text}) + b"\n\n",
+                    b"data: " + orjson.dumps({"done": True, "previous_os": prev_os, "next_os": next_os}) + b"\n\n"
+                ]
+                return Response(
+                    events,
+                    mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Cache": "HIT"}
+                )
+            
+            return jsonify({
+                "success": True,
+                "bridge": bridge_text,
+                "previous_os": prev_os,
+                "next_os": next_os
+            }), 200, {"X-Cache": "HIT"}
+        
+        logger.info(f"🤖 Generating story bridge with {model}...")
+        
+        if stream:
+            return Response(
+                stream_story_bridge(model, messages, prev_os, next_os, cache_key),
+                mimetype='text/event-stream',
+                headers={"Cache-Control": "no-cache", "X-Cache": "MISS"}
+            )
+        
+        response = await litellm.acompletion(
             model=model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.8,
             max_tokens=150
         )
         
         bridge_text = response.choices[0].message.content.strip()
+        save_cached_bridge(cache_key, bridge_text)
         
-        print(f"✅ Story bridge generated: {len(bridge_text)} chars")
+        logger.info(f"✅ Story bridge generated: {len(bridge_text)} chars")
         
         return jsonify({
             "success": True,
             "bridge": bridge_text,
             "previous_os": prev_os,
             "next_os": next_os
-        }), 200
+        }), 200, {"X-Cache": "MISS"}
         
     except Exception as e:
         return jsonify({"error": f"Story generation failed: {str(e)}"}), 500
@@ -3,12 +3,29 @@ Sprite generation endpoint
 Handles /api/generate-sprites
 """
 from flask import Blueprint, request, jsonify
-from services.image_service import generate_enemy_sprite, generate_boss_sprite, generate_player_sprite
+from pydantic import ValidationError
+from models.requests import GenerateSpritesRequest
+from services.image_service import agenerate_sprites_batch
+from utils.validation import format_validation_error
 
 sprites_bp = Blueprint('sprites', __name__)
 
+
+def apply_image_result(entry, outcome):
+    """Fill an image result entry from a (success, image, error) outcome"""
+    if isinstance(outcome, Exception):
+        entry['error'] = f"{type(outcome).__name__}: {str(outcome)}"
+        return
+    
+    success, image, error = outcome
+    if success:
+        entry['image'] = image
+    else:
+        entry['error'] = error
+
+
 @sprites_bp.route('/generate-sprites', methods=['POST'])
-def generate_sprites():
+async def generate_sprites():
     """
     Generate enemy, boss, player, and bullet sprites
     
@@ -28,90 +45,63 @@ def generate_sprites():
     Returns:
         Base64-encoded sprite images
     """
-    data = request.get_json()
+    # Parse and validate the raw body in one pass (pydantic's JSON parser)
+    data = request.get_data(cache=False)
     
     if not data:
         return jsonify({"error": "Missing request body"}), 400
     
-    color = data.get('color', '#00FFD1')
-    player = data.get('player')
-    enemies = data.get('enemies', [])
-    bosses = data.get('bosses', [])
+    try:
+        req = GenerateSpritesRequest.model_validate_json(data)
+    except ValidationError as e:
+        return jsonify({"error": format_validation_error(e)}), 400
+    
+    color = req.color
     
     results = {
-        "game_id": data.get('game_id'),
+        "game_id": req.game_id,
         "player_sprite": None,
         "enemy_sprites": [],
         "boss_sprites": []
     }
     
-    # Generate player sprite
-    if player:
-        player_id = player.get('id')
-        sprite_prompt = player.get('sprite_prompt')
-        
-        if sprite_prompt:
-            success, image, error = generate_player_sprite(sprite_prompt, color)
-            
-            if success:
-                results['player_sprite'] = {
-                    "id": player_id,
-                    "image": image
-                }
-            else:
-                results['player_sprite'] = {
-                    "id": player_id,
-                    "error": error
-                }
+    # Result entries are created in input order; every sprite is then
+    # generated in one batched call and the outcomes are split back out
+    jobs = []
     
-    # Generate enemy sprites
-    for enemy in enemies:
-        enemy_id = enemy.get('id')
-        sprite_prompt = enemy.get('sprite_prompt')
+    # Player sprite
+    if req.player and req.player.sprite_prompt:
+        entry = {"id": req.player.id}
+        results['player_sprite'] = entry
+        jobs.append((entry, {"kind": "player", "prompt": req.player.sprite_prompt}))
+    
+    # Enemy sprites
+    for enemy in req.enemies:
+        entry = {"id": enemy.id}
+        results['enemy_sprites'].append(entry)
+        sprite_prompt = enemy.sprite_prompt
         
         if not sprite_prompt:
-            results['enemy_sprites'].append({
-                "id": enemy_id,
-                "error": "Missing sprite_prompt"
-            })
+            entry['error'] = "Missing sprite_prompt"
             continue
         
-        success, image, error = generate_enemy_sprite(sprite_prompt, color)
-        
-        if success:
-            results['enemy_sprites'].append({
-                "id": enemy_id,
-                "image": image
-            })
-        else:
-            results['enemy_sprites'].append({
-                "id": enemy_id,
-                "error": error
-            })
+        jobs.append((entry, {"kind": "enemy", "prompt": sprite_prompt}))
     
-    # Generate boss sprites
-    for boss in bosses:
-        boss_id = boss.get('id')
-        sprite_prompt = boss.get('sprite_prompt')
+    # Boss sprites
+    for boss in req.bosses:
+        entry = {"id": boss.id}
+        results['boss_sprites'].append(entry)
+        sprite_prompt = boss.sprite_prompt
         
         if not sprite_prompt:
-            results['boss_sprites'].append({
-                "id": boss_id,
-                "error": "Missing sprite_prompt"
-            })
+            entry['error'] = "Missing sprite_prompt"
             continue
         
-        success, image, error = generate_boss_sprite(sprite_prompt, color)
-        
-        if success:
-            results['boss_sprites'].append({
-                "id": boss_id,
-                "image": image
-            })
-        else:
-            results['boss_sprites'].append({
-                "id": boss_id,
-                "error": error
-            })
+        jobs.append((entry, {"kind": "boss", "prompt": sprite_prompt}))
+    
+    outcomes = await agenerate_sprites_batch([job for _, job in jobs], color)
+    
+    for (entry, _), outcome in zip(jobs, outcomes):
+        apply_image_result(entry, outcome)
     
     return jsonify(results), 200
@@ -2,13 +2,18 @@
 Texture generation endpoint
 Handles /api/generate-textures
 """
+import asyncio
 from flask import Blueprint, request, jsonify
-from services.image_service import generate_parallax_layer, generate_tui_frame
+from pydantic import ValidationError
+from models.requests import GenerateTexturesRequest
+from services.image_service import agenerate_parallax_layer, agenerate_tui_frame
+from routes.sprites import apply_image_result
+from utils.validation import format_validation_error
 
 textures_bp = Blueprint('textures', __name__)
 
 @textures_bp.route('/generate-textures', methods=['POST'])
-def generate_textures():
+async def generate_textures():
     """
     Generate parallax backgrounds and TUI frame textures
     
@@ -26,82 +31,56 @@ def generate_textures():
     Returns:
         Base64-encoded texture images
     """
-    data = request.get_json()
+    # Parse and validate the raw body in one pass (pydantic's JSON parser)
+    data = request.get_data(cache=False)
     
     if not data:
         return jsonify({"error": "Missing request body"}), 400
     
-    theme = data.get('theme', '')
-    color = data.get('color', '#00FFD1')
-    parallax_layers = data.get('parallax_layers', [])
-    tui_frame_prompt = data.get('tui_frame_prompt')
-    tui_frames = data.get('tui_frames', [])
+    try:
+        req = GenerateTexturesRequest.model_validate_json(data)
+    except ValidationError as e:
+        return jsonify({"error": format_validation_error(e)}), 400
+    
+    theme = req.theme
+    color = req.color
     
     results = {
-        "game_id": data.get('game_id'),
+        "game_id": req.game_id,
         "parallax": [],
         "tui_frames": []
     }
     
+    # Result entries are created in input order; generation runs concurrently
+    jobs = []
+    
     # Generate parallax layers
-    for layer in parallax_layers:
-        layer_id = layer.get('id')
-        prompt = layer.get('prompt')
-        depth = layer.get('depth', 0.5)
-        
-        success, image, error = generate_parallax_layer(theme, prompt, depth, color)
-        
-        if success:
-            results['parallax'].append({
-                "id": layer_id,
-                "image": image,
-                "depth": depth
-            })
-        else:
-            results['parallax'].append({
-                "id": layer_id,
-                "error": error,
-                "depth": depth
-            })
+    for layer in req.parallax_layers:
+        entry = {"id": layer.id, "depth": layer.depth}
+        results['parallax'].append(entry)
+        jobs.append((entry, agenerate_parallax_layer(theme, layer.prompt, layer.depth, color)))
     
     # Generate TUI frame (single prompt)
-    if tui_frame_prompt:
-        success, image, error = generate_tui_frame(tui_frame_prompt, color)
-        
-        if success:
-            results['tui_frames'].append({
-                "id": "main_frame",
-                "image": image
-            })
-        else:
-            results['tui_frames'].append({
-                "id": "main_frame",
-                "error": error
-            })
+    if req.tui_frame_prompt:
+        entry = {"id": "main_frame"}
+        results['tui_frames'].append(entry)
+        jobs.append((entry, agenerate_tui_frame(req.tui_frame_prompt, color)))
     
     # Generate TUI frames (array format)
-    for tui_frame in tui_frames:
-        frame_id = tui_frame.get('id')
-        prompt = tui_frame.get('prompt')
+    for tui_frame in req.tui_frames:
+        entry = {"id": tui_frame.id}
+        results['tui_frames'].append(entry)
+        prompt = tui_frame.prompt
         
         if not prompt:
-            results['tui_frames'].append({
-                "id": frame_id,
-                "error": "Missing prompt"
-            })
+            entry['error'] = "Missing prompt"
             continue
         
-        success, image, error = generate_tui_frame(prompt, color)
-        
-        if success:
-            results['tui_frames'].append({
-                "id": frame_id,
-                "image": image
-            })
-        else:
-            results['tui_frames'].append({
-                "id": frame_id,
-                "error": error
-            })
+        jobs.append((entry, agenerate_tui_frame(prompt, color)))
+    
+    outcomes = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+    
+    for (entry, _), outcome in zip(jobs, outcomes):
+        apply_image_result(entry, outcome)
     
     return jsonify(results), 200
@@ -3,7 +3,7 @@
 
 -- Campaigns: Player progression tracking
 CREATE TABLE IF NOT EXISTS campaigns (
-    campaign_id TEXT PRIMARY KEY,
+    campaign_id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
     player_id TEXT NOT NULL,
     current_stage_num INTEGER DEFAULT 0,
     total_score INTEGER DEFAULT 0,
@@ -16,7 +16,7 @@ CREATE TABLE IF NOT EXISTS campaigns (
 
 -- Game Sessions: Individual stage playthroughs
 CREATE TABLE IF NOT EXISTS game_sessions (
-    session_id TEXT PRIMARY KEY,
+    session_id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
     campaign_id TEXT NOT NULL,
     game_id TEXT NOT NULL,
     stage_num INTEGER NOT NULL,
@@ -30,7 +30,7 @@ CREATE TABLE IF NOT EXISTS game_sessions (
 
 -- Completed Stages: Shared world content pool
 CREATE TABLE IF NOT EXISTS completed_stages (
-    stage_id TEXT PRIMARY KEY,
+    stage_id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
     creator_player_id TEXT NOT NULL,
     game_data TEXT NOT NULL,  -- JSON: Full game_data from LLM
     player_prompt TEXT NOT NULL,
@@ -41,9 +41,15 @@ CREATE TABLE IF NOT EXISTS completed_stages (
 );
 
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_campaigns_player ON campaigns(player_id);
-CREATE INDEX IF NOT EXISTS idx_sessions_campaign ON game_sessions(campaign_id);
+-- Composite indexes also serve the ORDER BY of the per-player/per-campaign listings
+CREATE INDEX IF NOT EXISTS idx_campaigns_player_updated ON campaigns(player_id, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_campaign_created ON game_sessions(campaign_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_sessions_game ON game_sessions(game_id);
 CREATE INDEX IF NOT EXISTS idx_completed_creator ON completed_stages(creator_player_id);
-CREATE INDEX IF NOT EXISTS idx_completed_difficulty ON completed_stages(difficulty);
+CREATE INDEX IF NOT EXISTS idx_completed_difficulty_creator ON completed_stages(difficulty, creator_player_id);
 CREATE INDEX IF NOT EXISTS idx_completed_times_played ON completed_stages(times_played);
+
+-- Single-column indexes superseded by the composites above
+DROP INDEX IF EXISTS idx_campaigns_player;
+DROP INDEX IF EXISTS idx_sessions_campaign;
+DROP INDEX IF EXISTS idx_completed_difficulty;
@@ -1,6 +1,14 @@
 """AI service integrations (Step 3+)"""
+from .http_client import HTTP_CLIENT
 from .llm_service import (
     generate_game_json,
+    generate_game_json_coalesced,
+    agenerate_game_json,
+    stream_game_json,
+    generate_games_batch,
+    generate_game_variants,
+    agenerate_game_variants,
+    get_llm_cache_stats,
     test_llm_connection,
     SYSTEM_PROMPT
 )
@@ -15,7 +23,15 @@ from .image_service import (
 )
 
 __all__ = [
+    'HTTP_CLIENT',
     'generate_game_json',
+    'generate_game_json_coalesced',
+    'agenerate_game_json',
+    'stream_game_json',
+    'generate_games_batch',
+    'generate_game_variants',
+    'agenerate_game_variants',
+    'get_llm_cache_stats',
     'test_llm_connection',
     'SYSTEM_PROMPT',
     'generate_image',
@@ -0,0 +1,26 @@
+"""
+Shared HTTP connection pool for the LLM and image backends
+"""
+import atexit
+import httpx
+import litellm
+
+# One keep-alive pool for the whole process so repeated calls to the same
+# provider reuse TCP + TLS connections instead of handshaking every time
+HTTP_CLIENT = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    timeout=httpx.Timeout(600.0, connect=10.0),
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+
+# LiteLLM sends sync completion/image requests through this client
+litellm.client_session = HTTP_CLIENT
+
+
+def close_http_client():
+    """Close pooled connections on interpreter shutdown"""
+    HTTP_CLIENT.close()
+
+
+atexit.register(close_http_client)
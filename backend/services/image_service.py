@@ -2,30 +2,92 @@
 Image generation service using Gemini (primary) and GPT-image-1 (fallback)
 """
 import os
-import base64
+import asyncio
 import hashlib
+import mmap
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
-import requests
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from google import genai
 from google.genai import types
 import litellm
 import logging
+import orjson
 import sys
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.image_processing import remove_solid_background
+from utils.image_processing import split_data_uri, decode_image_data, remove_background_png, webp_bytes
+from utils.fast_base64 import b64encode_str, b64decode
+from services.http_client import HTTP_CLIENT
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache for MVP
-IMAGE_CACHE: Dict[str, str] = {}
+
+class BoundedCache:
+    """Thread-safe LRU of data URIs bounded by entry count and total size"""
+    
+    def __init__(self, max_items: int, max_bytes: int):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value and mark it recently used"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key: str, value: str):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            
+            # Values over budget (or a zero-sized cache) are not kept at all
+            if self.max_items <= 0 or len(value) > self.max_bytes:
+                return
+            
+            self._entries[key] = value
+            self.total_bytes += len(value)
+            
+            # Evict least recently used entries
+            while len(self._entries) > self.max_items or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# In-memory LRU in front of the filesystem cache
+IMAGE_MEM_CACHE_MB = int(os.getenv('IMAGE_MEM_CACHE_MB', '256'))
+IMAGE_MEM_CACHE_ITEMS = int(os.getenv('IMAGE_MEM_CACHE_ITEMS', '512'))
+IMAGE_CACHE = BoundedCache(IMAGE_MEM_CACHE_ITEMS, IMAGE_MEM_CACHE_MB * 1024 * 1024)
 
 # Image generation timeouts
 TIMEOUT_PRIMARY = int(os.getenv('IMAGE_TIMEOUT_PRIMARY_SEC', '30'))
 TIMEOUT_FALLBACK = int(os.getenv('IMAGE_TIMEOUT_FALLBACK_SEC', '180'))
 
+# Max concurrent image generations across all requests. A thread semaphore
+# (not asyncio) because every async view runs in its own event loop.
+IMAGE_CONCURRENCY = int(os.getenv('IMAGE_CONCURRENCY', '6'))
+_IMG_SEM = threading.BoundedSemaphore(IMAGE_CONCURRENCY)
+
 # Cache TTL
 CACHE_TTL_TEXTURES = int(os.getenv('CACHE_TTL_TEXTURES_SEC', '86400'))
 CACHE_TTL_SPRITES = int(os.getenv('CACHE_TTL_SPRITES_SEC', '86400'))
@@ -34,52 +96,179 @@ CACHE_TTL_SPRITES = int(os.getenv('CACHE_TTL_SPRITES_SEC', '86400'))
 CACHE_DIR = Path(__file__).parent.parent / 'cache' / 'images'
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Content-addressed image store; cache entries are hard links into it
+CACHE_OBJECTS_DIR = CACHE_DIR / '_objects'
+
+# Page-cache prefetch budget for cached images at startup (0 disables)
+CACHE_WARM_MAX_MB = int(os.getenv('CACHE_WARM_MAX_MB', '512'))
+_CACHE_WARMER: Optional[threading.Thread] = None
+_CACHE_WARMER_LOCK = threading.Lock()
 
+# Base64 characters decoded per chunk when streaming to disk (multiple of 4)
+CACHE_DECODE_CHUNK = 64 * 1024
+
+# Cached file extension -> data URI MIME type
+CACHE_IMAGE_FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+
+@lru_cache(maxsize=1024)
 def get_cache_key(prompt: str, size: str, model: str) -> str:
-    """Generate cache key from prompt, size, and model"""
+    """Generate cache key from prompt, size, and model (memoized, keys are stable on disk)"""
     key_str = f"{prompt}|{size}|{model}"
     return hashlib.sha256(key_str.encode()).hexdigest()
 
 
-def save_image_to_cache(cache_key: str, base64_data: str, image_type: str = "image") -> Optional[str]:
+def store_cache_object(object_name: str, source: Union[bytes, str, Path]) -> Path:
+    """
+    Add content to the content-addressed object store
+    
+    Args:
+        object_name: Content-derived file name of the object
+        source: File contents (bytes or ASCII text), or a staged file to move in
+    
+    Returns:
+        Path of the stored object
+    """
+    object_path = CACHE_OBJECTS_DIR / object_name[:2] / object_name
+    if object_path.exists():
+        if isinstance(source, Path):
+            source.unlink(missing_ok=True)
+        return object_path
+    
+    object_path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(source, Path):
+        os.replace(source, object_path)
+        return object_path
+    
+    # Write under a temp name so a partial object is never linked
+    fd, tmp_name = tempfile.mkstemp(dir=object_path.parent, prefix=f".{object_name}.", suffix=".tmp")
+    try:
+        with open(fd, 'wb') as f:
+            f.write(source.encode('ascii') if isinstance(source, str) else source)
+        os.replace(tmp_name, object_path)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return object_path
+
+
+def stage_decoded_image(base64_content: str) -> Tuple[Path, str]:
+    """
+    Decode base64 into a staging file chunk by chunk, hashing as it goes
+    
+    Peak memory stays at one chunk instead of the whole decoded image.
+    
+    Args:
+        base64_content: Base64 payload (no data URL prefix)
+    
+    Returns:
+        Tuple of (staged file path, SHA-256 hex digest of the decoded bytes)
+    """
+    CACHE_OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    fd, staged_name = tempfile.mkstemp(dir=CACHE_OBJECTS_DIR, prefix=".incoming.", suffix=".tmp")
+    staged_path = Path(staged_name)
+    digest = hashlib.sha256()
+    
+    try:
+        with open(fd, 'wb') as f:
+            for offset in range(0, len(base64_content), CACHE_DECODE_CHUNK):
+                chunk = b64decode(base64_content[offset:offset + CACHE_DECODE_CHUNK])
+                digest.update(chunk)
+                f.write(chunk)
+    except Exception:
+        staged_path.unlink(missing_ok=True)
+        raise
+    
+    return staged_path, digest.hexdigest()
+
+
+def link_cache_object(file_path: Path, object_path: Path):
+    """
+    Point a cache entry at a stored object via a hard link
+    
+    Identical images cached under different keys share one file on disk.
+    Falls back to a copy where hard links aren't supported. The entry is
+    swapped in with os.replace, so readers never see a partial file.
+    """
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(object_path, tmp_path)
+        except OSError:
+            shutil.copyfile(object_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        # rename() is a no-op when both names already link the same object
+        tmp_path.unlink(missing_ok=True)
+
+
+def save_image_to_cache(
+    cache_key: str,
+    base64_data: str,
+    image_type: str = "image",
+    image_bytes: Optional[bytes] = None
+) -> Optional[str]:
     """
     Save image to filesystem cache
     
+    Writes the raw image bytes plus a `.b64` sidecar holding the exact data
+    URI, so cache hits can be served without re-encoding.
+    
     Args:
         cache_key: Cache key (hash)
         base64_data: Base64 data URI
         image_type: Type of image (parallax, enemy, boss, tui_frame)
-        
+        image_bytes: Decoded image, if the caller already has it (skips decoding)
+    
     Returns:
         File path if saved successfully, None otherwise
     """
     try:
-        # Extract base64 content (remove data:image/png;base64, prefix)
-        if base64_data.startswith('data:image/png;base64,'):
-            base64_content = base64_data.split(',', 1)[1]
-        else:
-            base64_content = base64_data
+        # Extract base64 content (remove data:<mime>;base64, prefix)
+        header, base64_content = split_data_uri(base64_data)
+        extension = "webp" if header and header.startswith('data:image/webp') else "png"
+        if header is None:
+            base64_data = f"data:{CACHE_IMAGE_FORMATS[extension]};base64,{base64_content}"
         
-        # Decode base64 to bytes
-        image_bytes = base64.b64decode(base64_content)
+        # Store the image bytes as a content-addressed object, streaming the
+        # base64 decode when the caller doesn't already hold the bytes
+        if image_bytes is None:
+            staged_path, content_hash = stage_decoded_image(base64_content)
+            object_path = store_cache_object(f"{content_hash}.{extension}", staged_path)
+        else:
+            content_hash = hashlib.sha256(image_bytes).hexdigest()
+            object_path = store_cache_object(f"{content_hash}.{extension}", image_bytes)
         
         # Create subdirectory for image type
         type_dir = CACHE_DIR / image_type
         type_dir.mkdir(exist_ok=True)
         
-        # Save to file
-        file_path = type_dir / f"{cache_key}.png"
-        with open(file_path, 'wb') as f:
-            f.write(image_bytes)
+        # Save to file (hard-linked to its object)
+        file_path = type_dir / f"{cache_key}.{extension}"
+        link_cache_object(file_path, object_path)
         
-        print(f"💾 Saved to cache: {file_path.relative_to(CACHE_DIR.parent)}")
-        return str(file_path)
+        # Save the data URI last so a present sidecar implies a complete entry
+        sidecar_object = store_cache_object(f"{content_hash}.{extension}.b64", base64_data)
+        link_cache_object(type_dir / f"{cache_key}.b64", sidecar_object)
         
+        logger.debug(f"💾 Saved to cache: {file_path.relative_to(CACHE_DIR.parent)}")
+        return str(file_path)
+    
     except Exception as e:
-        print(f"⚠️  Failed to save image to cache: {e}")
+        logger.warning(f"⚠️  Failed to save image to cache: {e}")
         return None
 
 
+def _find_cached_image(cache_key: str, image_type: str) -> Optional[Tuple[Path, str]]:
+    """Return (file path, MIME type) of a cached image, or None"""
+    for extension, mime_type in CACHE_IMAGE_FORMATS.items():
+        file_path = CACHE_DIR / image_type / f"{cache_key}.{extension}"
+        if file_path.exists():
+            return file_path, mime_type
+    return None
+
+
 def load_image_from_cache(cache_key: str, image_type: str = "image") -> Optional[str]:
     """
     Load image from filesystem cache
@@ -87,32 +276,149 @@ def load_image_from_cache(cache_key: str, image_type: str = "image") -> Optional
     Args:
         cache_key: Cache key (hash)
         image_type: Type of image (parallax, enemy, boss, tui_frame)
-        
+    
     Returns:
         Base64 data URI if found, None otherwise
     """
     try:
-        file_path = CACHE_DIR / image_type / f"{cache_key}.png"
+        # Fast path: the data URI was stored as-is
+        b64_path = CACHE_DIR / image_type / f"{cache_key}.b64"
+        try:
+            data_uri = b64_path.read_text(encoding='ascii')
+            logger.debug(f"📦 Loaded from cache: {b64_path.relative_to(CACHE_DIR.parent)}")
+            return data_uri
+        except FileNotFoundError:
+            pass
         
-        if not file_path.exists():
+        # Entries cached before sidecars existed: encode the raw file
+        found = _find_cached_image(cache_key, image_type)
+        if found is None:
             return None
+        file_path, mime_type = found
         
-        # Read file
-        with open(file_path, 'rb') as f:
-            image_bytes = f.read()
+        # Encode straight from the page cache via mmap (no intermediate bytes copy)
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image_map:
+            base64_str = b64encode_str(image_map)
         
         # Convert to base64 data URI
-        base64_str = base64.b64encode(image_bytes).decode('utf-8')
-        data_uri = f"data:image/png;base64,{base64_str}"
+        data_uri = f"data:{mime_type};base64,{base64_str}"
         
-        print(f"📦 Loaded from cache: {file_path.relative_to(CACHE_DIR.parent)}")
+        logger.debug(f"📦 Loaded from cache: {file_path.relative_to(CACHE_DIR.parent)}")
         return data_uri
+    
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to load image from cache: {e}")
+        return None
+
+
+def load_image_bytes_from_cache(cache_key: str, image_type: str = "image") -> Optional[Tuple[bytes, str]]:
+    """
+    Load raw image bytes from filesystem cache (no base64 transform)
+    
+    Args:
+        cache_key: Cache key (hash)
+        image_type: Type of image (parallax, enemy, boss, tui_frame)
+    
+    Returns:
+        (image bytes, MIME type) if found, None otherwise
+    """
+    try:
+        found = _find_cached_image(cache_key, image_type)
+        if found is None:
+            return None
+        file_path, mime_type = found
         
+        with open(file_path, 'rb') as f:
+            return f.read(), mime_type
+    
     except Exception as e:
-        print(f"⚠️  Failed to load image from cache: {e}")
+        logger.warning(f"⚠️  Failed to load image from cache: {e}")
         return None
 
 
+# Prompts Gemini refused on safety grounds (key -> expiry); they go straight
+# to the fallback instead of repeating a call that will be blocked again
+SAFETY_BLOCK_PREFIX = "Content blocked by safety filters"
+BLOCKED_PROMPT_TTL = int(os.getenv('BLOCKED_PROMPT_TTL_SEC', '604800'))
+BLOCKED_PROMPTS_FILE = CACHE_DIR.parent / 'blocked_prompts.json'
+_BLOCKED_PROMPTS: Optional[Dict[str, float]] = None
+_BLOCKED_PROMPTS_LOCK = threading.Lock()
+
+
+# Shared Gemini client so bursts of generations reuse its connection pool
+_GEMINI_API_KEY: Optional[str] = os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
+_GEMINI_CLIENT: Optional[genai.Client] = None
+_GEMINI_CLIENT_KEY: Optional[str] = None
+_GEMINI_CLIENT_LOCK = threading.Lock()
+
+
+def get_gemini_api_key() -> Optional[str]:
+    """Return the Gemini API key, read from the environment once it is set"""
+    global _GEMINI_API_KEY
+    if not _GEMINI_API_KEY:
+        # Missing keys are re-checked so a key set after import is picked up
+        _GEMINI_API_KEY = os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
+    return _GEMINI_API_KEY
+
+
+def get_gemini_client(api_key: str) -> genai.Client:
+    """Return the shared Gemini client, creating it on first use or key change"""
+    global _GEMINI_CLIENT, _GEMINI_CLIENT_KEY
+    with _GEMINI_CLIENT_LOCK:
+        if _GEMINI_CLIENT is None or _GEMINI_CLIENT_KEY != api_key:
+            # Bound slow generations so the OpenAI fallback gets a chance
+            _GEMINI_CLIENT = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(timeout=TIMEOUT_PRIMARY * 1000)
+            )
+            _GEMINI_CLIENT_KEY = api_key
+        return _GEMINI_CLIENT
+
+
+def _load_blocked_prompts() -> Dict[str, float]:
+    """Load unexpired safety-blocked prompt keys from disk"""
+    try:
+        entries = orjson.loads(BLOCKED_PROMPTS_FILE.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to load blocked prompt cache: {e}")
+        return {}
+    now = time.time()
+    return {key: expires for key, expires in entries.items() if expires > now}
+
+
+def is_prompt_blocked(prompt_key: str) -> bool:
+    """Whether Gemini refused this prompt within BLOCKED_PROMPT_TTL"""
+    global _BLOCKED_PROMPTS
+    with _BLOCKED_PROMPTS_LOCK:
+        if _BLOCKED_PROMPTS is None:
+            _BLOCKED_PROMPTS = _load_blocked_prompts()
+        expires = _BLOCKED_PROMPTS.get(prompt_key)
+        if expires is None:
+            return False
+        if expires <= time.time():
+            del _BLOCKED_PROMPTS[prompt_key]
+            return False
+        return True
+
+
+def mark_prompt_blocked(prompt_key: str):
+    """Remember a safety-blocked prompt (in memory and in cache/blocked_prompts.json)"""
+    global _BLOCKED_PROMPTS
+    with _BLOCKED_PROMPTS_LOCK:
+        if _BLOCKED_PROMPTS is None:
+            _BLOCKED_PROMPTS = _load_blocked_prompts()
+        _BLOCKED_PROMPTS[prompt_key] = time.time() + BLOCKED_PROMPT_TTL
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=BLOCKED_PROMPTS_FILE.parent, prefix=".blocked_prompts.", suffix=".tmp")
+            with open(fd, 'wb') as f:
+                f.write(orjson.dumps(_BLOCKED_PROMPTS))
+            os.replace(tmp_name, BLOCKED_PROMPTS_FILE)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to save blocked prompt cache: {e}")
+
+
 def get_gemini_generation_config(temperature=0.8):
     """Helper to create generation config for Gemini image generation"""
     try:
@@ -164,7 +470,7 @@ def parse_gemini_response(response) -> Dict[str, Any]:
                                 
                                 # Convert bytes to base64 if needed
                                 if isinstance(image_data, bytes):
-                                    image_b64 = base64.b64encode(image_data).decode('utf-8')
+                                    image_b64 = b64encode_str(image_data)
                                 else:
                                     image_b64 = image_data
                                 
@@ -177,7 +483,7 @@ def parse_gemini_response(response) -> Dict[str, Any]:
                 if hasattr(candidate, 'finish_reason'):
                     finish_reason = str(candidate.finish_reason)
                     if 'SAFETY' in finish_reason or 'BLOCKED' in finish_reason:
-                        block_msg = f"Content blocked by safety filters: {finish_reason}"
+                        block_msg = f"{SAFETY_BLOCK_PREFIX}: {finish_reason}"
                         logger.error(block_msg)
                         return {"error": block_msg}
         
@@ -185,7 +491,7 @@ def parse_gemini_response(response) -> Dict[str, Any]:
             return {"image": output_image_url}
         else:
             return {"error": "No image found in response"}
-            
+    
     except Exception as e:
         logger.error(f"Error parsing Gemini response: {e}")
         return {"error": f"Failed to parse response: {e}"}
@@ -198,18 +504,18 @@ def generate_image_gemini(prompt: str, size: str = "1024x1024") -> Tuple[bool, O
     Args:
         prompt: Image description
         size: Image size (e.g., "1024x1024", "2048x512")
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
     try:
-        api_key = os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
+        api_key = get_gemini_api_key()
         if not api_key:
             return False, None, "GOOGLE_API_KEY or GEMINI_API_KEY not configured"
         
-        print(f"🎨 Generating image with Gemini 2.5 Flash Image Preview ({size})...")
+        logger.info(f"🎨 Generating image with Gemini 2.5 Flash Image Preview ({size})...")
         
-        client = genai.Client(api_key=api_key)
+        client = get_gemini_client(api_key)
         model = "gemini-2.5-flash-image-preview"
         model_name = f"models/{model}"
         
@@ -230,16 +536,16 @@ def generate_image_gemini(prompt: str, size: str = "1024x1024") -> Tuple[bool, O
         parsed_response = parse_gemini_response(response)
         
         if parsed_response.get("image"):
-            print(f"✅ Gemini image generated")
+            logger.info(f"✅ Gemini image generated")
             return True, parsed_response["image"], None
         else:
             error_msg = parsed_response.get("error", "Image generation failed")
             logger.error(f"Gemini image generation failed: {error_msg}")
             return False, None, error_msg
-            
+    
     except Exception as e:
         error_msg = f"Gemini error: {type(e).__name__}: {str(e)}"
-        print(f"⚠️  {error_msg}")
+        logger.warning(f"⚠️  {error_msg}")
         return False, None, error_msg
 
 
@@ -250,12 +556,12 @@ def generate_image_openai(prompt: str, size: str = "1024x1024") -> Tuple[bool, O
     Args:
         prompt: Image description
         size: Image size (e.g., "1024x1024", "2048x512")
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
     try:
-        print(f"🎨 Generating image with gpt-image-1 ({size})...")
+        logger.info(f"🎨 Generating image with gpt-image-1 ({size})...")
         
         # Map size to supported sizes
         openai_size = "1024x1024"
@@ -268,7 +574,8 @@ def generate_image_openai(prompt: str, size: str = "1024x1024") -> Tuple[bool, O
             prompt=prompt,
             size=openai_size,
             quality="standard",
-            n=1
+            n=1,
+            timeout=TIMEOUT_FALLBACK
         )
         
         # Extract image URL - response.data is a list of dicts
@@ -278,20 +585,20 @@ def generate_image_openai(prompt: str, size: str = "1024x1024") -> Tuple[bool, O
             return False, None, "Model returned None as image URL"
         
         # Download image
-        img_response = requests.get(image_url, timeout=TIMEOUT_FALLBACK)
+        img_response = HTTP_CLIENT.get(image_url, timeout=TIMEOUT_FALLBACK)
         img_response.raise_for_status()
         
         # Convert to base64
         img_bytes = img_response.content
-        base64_str = base64.b64encode(img_bytes).decode('utf-8')
+        base64_str = b64encode_str(img_bytes)
         data_uri = f"data:image/png;base64,{base64_str}"
         
-        print(f"✅ gpt-image-1 generated ({len(base64_str)} bytes)")
+        logger.info(f"✅ gpt-image-1 generated ({len(base64_str)} bytes)")
         return True, data_uri, None
-            
+    
     except Exception as e:
         error_msg = f"OpenAI error: {type(e).__name__}: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return False, None, error_msg
 
 
@@ -299,7 +606,8 @@ def generate_image(
     prompt: str,
     size: str = "1024x1024",
     use_cache: bool = True,
-    image_type: str = "image"
+    image_type: str = "image",
+    cache_key: Optional[str] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Generate image with Gemini (primary) and OpenAI (fallback)
@@ -309,58 +617,141 @@ def generate_image(
         size: Image size
         use_cache: Whether to use cache
         image_type: Type of image for cache organization
-        
+        cache_key: Precomputed get_cache_key(prompt, size, image_type)
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
     # Use consistent cache key regardless of which model generates it
-    cache_key = get_cache_key(prompt, size, image_type) if use_cache else None
+    if not use_cache:
+        cache_key = None
+    elif cache_key is None:
+        cache_key = get_cache_key(prompt, size, image_type)
     
     # Check filesystem cache first
     if use_cache and cache_key:
-        print(f"🔍 Checking cache for {image_type} (key: {cache_key[:16]}...)")
+        logger.debug(f"🔍 Checking cache for {image_type} (key: {cache_key[:16]}...)")
+        
+        # Try memory cache
+        cached_image = IMAGE_CACHE.get(cache_key)
+        if cached_image:
+            logger.info(f"✅ Memory cache HIT for {image_type}")
+            return True, cached_image, None
         
         # Try filesystem cache
         cached_image = load_image_from_cache(cache_key, image_type)
         if cached_image:
-            print(f"✅ Filesystem cache HIT for {image_type}")
+            logger.info(f"✅ Filesystem cache HIT for {image_type}")
             # Also store in memory cache
             IMAGE_CACHE[cache_key] = cached_image
             return True, cached_image, None
         
-        # Try memory cache
-        if cache_key in IMAGE_CACHE:
-            print(f"✅ Memory cache HIT for {image_type}")
-            return True, IMAGE_CACHE[cache_key], None
-        
-        print(f"❌ Cache MISS for {image_type} - generating new image")
+        logger.info(f"❌ Cache MISS for {image_type} - generating new image")
     
-    # Try Gemini first
-    success, image, error = generate_image_gemini(prompt, size)
+    prompt_key = cache_key or get_cache_key(prompt, size, image_type)
     
-    if success and image:
-        # Cache result
-        if use_cache and cache_key:
-            IMAGE_CACHE[cache_key] = image
-            save_image_to_cache(cache_key, image, image_type)
-            print(f"💾 Cached {image_type} image")
-        return True, image, None
-    
-    # Fallback to OpenAI
-    print(f"⚠️  Gemini failed, trying OpenAI fallback...")
-    success, image, error = generate_image_openai(prompt, size)
+    # Only the provider calls hold a concurrency slot, so cache hits and
+    # post-processing never queue behind slow generations
+    with _IMG_SEM:
+        if is_prompt_blocked(prompt_key):
+            # Gemini already refused this prompt; don't spend a call on it
+            logger.info(f"🚫 Prompt previously blocked by Gemini, skipping to OpenAI")
+            success, image, error = False, None, SAFETY_BLOCK_PREFIX
+        else:
+            # Try Gemini first
+            success, image, error = generate_image_gemini(prompt, size)
+            if error and error.startswith(SAFETY_BLOCK_PREFIX):
+                mark_prompt_blocked(prompt_key)
+        from_fallback = False
+        
+        if not (success and image):
+            # Fallback to OpenAI
+            logger.warning(f"⚠️  Gemini failed, trying OpenAI fallback...")
+            success, image, error = generate_image_openai(prompt, size)
+            from_fallback = True
     
     if success and image:
         # Cache result
         if use_cache and cache_key:
             IMAGE_CACHE[cache_key] = image
             save_image_to_cache(cache_key, image, image_type)
-            print(f"💾 Cached {image_type} image (from fallback)")
+            logger.debug(f"💾 Cached {image_type} image" + (" (from fallback)" if from_fallback else ""))
         return True, image, None
     
     return False, None, f"Both Gemini and OpenAI failed. Last error: {error}"
 
 
+def _remove_green_screen(image_bytes: bytes) -> bytes:
+    """Sprite chroma key removal (tolerance tuned for generated green screens)"""
+    return remove_background_png(image_bytes, tolerance=80)
+
+
+def process_and_cache(
+    cache_key: str,
+    base64_image: str,
+    image_type: str,
+    process: Callable[[bytes], bytes],
+    mime_type: str
+) -> str:
+    """
+    Post-process a generated image and cache the result
+    
+    The image is decoded and re-encoded once; the processed bytes go to the
+    cache as-is instead of being decoded again from the data URI.
+    
+    Args:
+        cache_key: Cache key for the processed image
+        base64_image: Generated image as a base64 data URI
+        image_type: Type of image for cache organization
+        process: Transform from source image bytes to output image bytes
+        mime_type: MIME type of the processed output
+    
+    Returns:
+        Processed base64 data URI (original image if processing fails)
+    """
+    try:
+        output_bytes = process(decode_image_data(base64_image))
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to process {image_type} image: {e}")
+        return base64_image
+    
+    data_uri = f"data:{mime_type};base64,{b64encode_str(output_bytes)}"
+    save_image_to_cache(cache_key, data_uri, image_type, image_bytes=output_bytes)
+    return data_uri
+
+
+def generate_texture(
+    full_prompt: str,
+    size: str,
+    image_type: str
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Generate a background/frame texture and re-encode it as WebP
+    
+    Args:
+        full_prompt: Complete image prompt
+        size: Image size
+        image_type: Type of image for cache organization
+    
+    Returns:
+        Tuple of (success, base64_image, error_message)
+    """
+    # Cache the encoded version separately from the raw provider image
+    cache_key = get_cache_key(full_prompt + "|webp", size, image_type)
+    
+    cached_webp = load_image_from_cache(cache_key, image_type)
+    if cached_webp:
+        logger.info(f"✅ WebP {image_type} loaded from cache")
+        return True, cached_webp, None
+    
+    success, base64_image, error = generate_image(full_prompt, size=size, image_type=image_type)
+    
+    if success and base64_image:
+        base64_image = process_and_cache(cache_key, base64_image, image_type, webp_bytes, "image/webp")
+    
+    return success, base64_image, error
+
+
 def generate_parallax_layer(
     theme: str,
     prompt: str,
@@ -375,7 +766,7 @@ def generate_parallax_layer(
         prompt: Layer-specific prompt
         depth: Depth factor (0.0-1.0)
         color: Accent color
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
@@ -386,7 +777,51 @@ painterly or illustrated style, not photorealistic,
 vibrant game art colors, depth layer {depth},
 no text, no UI elements"""
     
-    return generate_image(full_prompt, size="2048x512", image_type="parallax")
+    return generate_texture(full_prompt, size="2048x512", image_type="parallax")
+
+
+SPRITE_SIZE = "1024x1024"
+
+
+@lru_cache(maxsize=512)
+def sprite_cache_keys(full_prompt: str, image_type: str) -> Tuple[str, str]:
+    """Return (raw_key, nobg_key) for a sprite prompt (v6 = edge sampling)"""
+    return (
+        get_cache_key(full_prompt, SPRITE_SIZE, image_type),
+        get_cache_key(full_prompt + "|nobg|v6", SPRITE_SIZE, image_type)
+    )
+
+
+def generate_sprite(full_prompt: str, image_type: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Generate a green-screen sprite and cache its background-removed version
+    
+    Args:
+        full_prompt: Complete image prompt
+        image_type: Sprite kind (enemy, boss, player)
+    
+    Returns:
+        Tuple of (success, base64_image, error_message)
+    """
+    raw_key, nobg_key = sprite_cache_keys(full_prompt, image_type)
+    
+    # Check if background-removed version is cached
+    cached_nobg = load_image_from_cache(nobg_key, image_type)
+    if cached_nobg:
+        logger.info(f"✅ Background-removed {image_type} sprite loaded from cache")
+        return True, cached_nobg, None
+    
+    success, base64_image, error = generate_image(
+        full_prompt, size=SPRITE_SIZE, image_type=image_type, cache_key=raw_key
+    )
+    
+    if success and base64_image:
+        # Remove solid background to make it transparent, then cache it
+        logger.debug(f"  → Removing background from {image_type} sprite...")
+        base64_image = process_and_cache(nobg_key, base64_image, image_type, _remove_green_screen, "image/png")
+        logger.debug(f"💾 Cached background-removed {image_type} sprite")
+    
+    return success, base64_image, error
 
 
 def generate_enemy_sprite(
@@ -399,7 +834,7 @@ def generate_enemy_sprite(
     Args:
         description: Enemy description
         color: Accent color
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
@@ -410,27 +845,7 @@ The character should be centered with detailed colors and textures.
 Single character facing LEFT toward viewer, no text, no UI, clean cutout style.
 Background must be completely filled with bright green (#00FF00) for chroma keying."""
     
-    # Generate cache key for background-removed version (v6 = edge sampling)
-    cache_key = get_cache_key(full_prompt + "|nobg|v6", "1024x1024", "enemy")
-    
-    # Check if background-removed version is cached
-    cached_nobg = load_image_from_cache(cache_key, "enemy")
-    if cached_nobg:
-        print(f"✅ Background-removed enemy sprite loaded from cache")
-        return True, cached_nobg, None
-    
-    success, base64_image, error = generate_image(full_prompt, size="1024x1024", image_type="enemy")
-    
-    if success and base64_image:
-        # Remove solid background to make it transparent
-        print(f"  → Removing background from enemy sprite...")
-        base64_image = remove_solid_background(base64_image, tolerance=80)
-        
-        # Cache the background-removed version
-        save_image_to_cache(cache_key, base64_image, "enemy")
-        print(f"💾 Cached background-removed enemy sprite")
-    
-    return success, base64_image, error
+    return generate_sprite(full_prompt, "enemy")
 
 
 def generate_boss_sprite(
@@ -443,7 +858,7 @@ def generate_boss_sprite(
     Args:
         description: Boss description
         color: Accent color
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
@@ -454,27 +869,7 @@ The boss should be imposing with detailed colors and textures.
 Facing LEFT toward viewer, no text, no UI, clean cutout style.
 Background must be completely filled with bright green (#00FF00) for chroma keying."""
     
-    # Generate cache key for background-removed version (v6 = edge sampling)
-    cache_key = get_cache_key(full_prompt + "|nobg|v6", "1024x1024", "boss")
-    
-    # Check if background-removed version is cached
-    cached_nobg = load_image_from_cache(cache_key, "boss")
-    if cached_nobg:
-        print(f"✅ Background-removed boss sprite loaded from cache")
-        return True, cached_nobg, None
-    
-    success, base64_image, error = generate_image(full_prompt, size="1024x1024", image_type="boss")
-    
-    if success and base64_image:
-        # Remove solid background to make it transparent
-        print(f"  → Removing background from boss sprite...")
-        base64_image = remove_solid_background(base64_image, tolerance=80)
-        
-        # Cache the background-removed version
-        save_image_to_cache(cache_key, base64_image, "boss")
-        print(f"💾 Cached background-removed boss sprite")
-    
-    return success, base64_image, error
+    return generate_sprite(full_prompt, "boss")
 
 
 def generate_player_sprite(
@@ -487,7 +882,7 @@ def generate_player_sprite(
     Args:
         description: Player ship description
         color: Accent color
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
@@ -498,27 +893,7 @@ The ship should be centered with detailed colors and textures.
 Facing RIGHT, no text, no UI, clean cutout style.
 Background must be completely filled with bright green (#00FF00) for chroma keying."""
     
-    # Generate cache key for background-removed version (v6 = edge sampling)
-    cache_key = get_cache_key(full_prompt + "|nobg|v6", "1024x1024", "player")
-    
-    # Check if background-removed version is cached
-    cached_nobg = load_image_from_cache(cache_key, "player")
-    if cached_nobg:
-        print(f"✅ Background-removed player sprite loaded from cache")
-        return True, cached_nobg, None
-    
-    success, base64_image, error = generate_image(full_prompt, size="1024x1024", image_type="player")
-    
-    if success and base64_image:
-        # Remove solid background to make it transparent
-        print(f"  → Removing background from player sprite...")
-        base64_image = remove_solid_background(base64_image, tolerance=80)
-        
-        # Cache the background-removed version
-        save_image_to_cache(cache_key, base64_image, "player")
-        print(f"💾 Cached background-removed player sprite")
-    
-    return success, base64_image, error
+    return generate_sprite(full_prompt, "player")
 
 
 def generate_tui_frame(
@@ -531,7 +906,7 @@ def generate_tui_frame(
     Args:
         description: Frame description
         color: Accent color
-        
+    
     Returns:
         Tuple of (success, base64_image, error_message)
     """
@@ -539,7 +914,149 @@ def generate_tui_frame(
 giger filigree details, ornamental corners, no text content,
 retro computer aesthetic"""
     
-    return generate_image(full_prompt, size="1024x1024", image_type="tui_frame")
+    return generate_texture(full_prompt, size="1024x1024", image_type="tui_frame")
+
+
+# ============================================================================
+# ASYNC WRAPPERS
+# ============================================================================
+# The Gemini/OpenAI SDK calls are blocking, so each wrapper runs its sync
+# counterpart in a worker thread; callers fan out with asyncio.gather.
+# generate_image holds _IMG_SEM around provider calls only, so the fan-out
+# stays within IMAGE_CONCURRENCY while cache hits resolve immediately.
+
+async def agenerate_enemy_sprite(
+    description: str,
+    color: str = "#00FFD1"
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Async version of generate_enemy_sprite"""
+    return await asyncio.to_thread(generate_enemy_sprite, description, color)
+
+
+async def agenerate_boss_sprite(
+    description: str,
+    color: str = "#00FFD1"
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Async version of generate_boss_sprite"""
+    return await asyncio.to_thread(generate_boss_sprite, description, color)
+
+
+async def agenerate_player_sprite(
+    description: str,
+    color: str = "#00FFD1"
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Async version of generate_player_sprite"""
+    return await asyncio.to_thread(generate_player_sprite, description, color)
+
+
+async def agenerate_parallax_layer(
+    theme: str,
+    prompt: str,
+    depth: float,
+    color: str = "#00FFD1"
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Async version of generate_parallax_layer"""
+    return await asyncio.to_thread(generate_parallax_layer, theme, prompt, depth, color)
+
+
+async def agenerate_tui_frame(
+    description: str,
+    color: str = "#00FFD1"
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Async version of generate_tui_frame"""
+    return await asyncio.to_thread(generate_tui_frame, description, color)
+
+
+async def agenerate_sprites_batch(
+    prompts: List[Dict[str, str]],
+    color: str = "#00FFD1"
+) -> List[Tuple[bool, Optional[str], Optional[str]]]:
+    """
+    Generate a batch of sprites with one call
+    
+    The image providers take a single prompt per request, so the batch fans
+    out over the pooled HTTP client within the IMAGE_CONCURRENCY limit.
+    Cached sprites return without waiting for a generation slot.
+    
+    Args:
+        prompts: List of {"kind": "player" | "enemy" | "boss", "prompt": str}
+        color: Accent color
+    
+    Returns:
+        List of (success, base64_image, error_message) in input order
+    """
+    generators = {
+        "player": generate_player_sprite,
+        "enemy": generate_enemy_sprite,
+        "boss": generate_boss_sprite
+    }
+    
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(generators[item['kind']], item['prompt'], color) for item in prompts),
+        return_exceptions=True
+    )
+    
+    return [
+        (False, None, f"{type(outcome).__name__}: {str(outcome)}") if isinstance(outcome, Exception) else outcome
+        for outcome in outcomes
+    ]
+
+
+def warm_cache(max_bytes: int = CACHE_WARM_MAX_MB * 1024 * 1024) -> int:
+    """
+    Ask the kernel to prefetch cached data URIs into the page cache
+    
+    Newest entries are advised first, up to max_bytes, so first cache hits
+    after a restart don't wait on disk.
+    
+    Args:
+        max_bytes: Upper bound on bytes to prefetch
+    
+    Returns:
+        Number of bytes advised
+    """
+    if not hasattr(os, 'posix_fadvise') or not CACHE_DIR.exists():
+        return 0
+    
+    entries = []
+    with os.scandir(CACHE_DIR) as subdirs:
+        for subdir in subdirs:
+            if not subdir.is_dir(follow_symlinks=False) or subdir.path == str(CACHE_OBJECTS_DIR):
+                continue
+            with os.scandir(subdir.path) as files:
+                for file in files:
+                    if file.name.endswith(".b64"):
+                        stat = file.stat()
+                        entries.append((stat.st_mtime, stat.st_size, file.path))
+    
+    advised = 0
+    for _, size, path in sorted(entries, reverse=True):
+        if advised + size > max_bytes:
+            break
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+            advised += size
+        except OSError:
+            continue
+    
+    if advised:
+        logger.info(f"🔥 Prefetched {advised // 1024} KB of cached images")
+    return advised
+
+
+def start_cache_warmer() -> Optional[threading.Thread]:
+    """Run warm_cache once per process on a background thread"""
+    global _CACHE_WARMER
+    with _CACHE_WARMER_LOCK:
+        if _CACHE_WARMER is not None or CACHE_WARM_MAX_MB <= 0:
+            return None
+        _CACHE_WARMER = threading.Thread(target=warm_cache, name="image-cache-warmer", daemon=True)
+        _CACHE_WARMER.start()
+        return _CACHE_WARMER
 
 
 def clear_cache(clear_filesystem: bool = False):
@@ -549,34 +1066,45 @@ def clear_cache(clear_filesystem: bool = False):
     Args:
         clear_filesystem: If True, also delete cached files from disk
     """
-    global IMAGE_CACHE
-    IMAGE_CACHE = {}
-    print("🗑️  Memory cache cleared")
+    IMAGE_CACHE.clear()
+    logger.info("🗑️  Memory cache cleared")
     
     if clear_filesystem:
-        import shutil
         if CACHE_DIR.exists():
             shutil.rmtree(CACHE_DIR)
             CACHE_DIR.mkdir(parents=True, exist_ok=True)
-            print("🗑️  Filesystem cache cleared")
+            logger.info("🗑️  Filesystem cache cleared")
 
 
 def get_cache_stats() -> Dict[str, Any]:
     """Get cache statistics"""
-    # Count filesystem cached images
+    # Count filesystem cached images (scandir reuses readdir's type info).
+    # Entries are hard links to shared objects, so size each inode once.
     fs_count = 0
     fs_size = 0
+    seen_inodes = set()
+    image_suffixes = tuple(f".{extension}" for extension in CACHE_IMAGE_FORMATS)
     
     if CACHE_DIR.exists():
-        for subdir in CACHE_DIR.iterdir():
-            if subdir.is_dir():
-                for file in subdir.glob("*.png"):
-                    fs_count += 1
-                    fs_size += file.stat().st_size
+        with os.scandir(CACHE_DIR) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir(follow_symlinks=False) or subdir.path == str(CACHE_OBJECTS_DIR):
+                    continue
+                with os.scandir(subdir.path) as files:
+                    for file in files:
+                        is_image = file.name.endswith(image_suffixes)
+                        # Data URI sidecars take disk space but aren't separate images
+                        if not (is_image or file.name.endswith(".b64")):
+                            continue
+                        if is_image:
+                            fs_count += 1
+                        if file.inode() not in seen_inodes:
+                            seen_inodes.add(file.inode())
+                            fs_size += file.stat().st_size
     
     return {
         "memory_cached_images": len(IMAGE_CACHE),
-        "memory_size_bytes": sum(len(img) for img in IMAGE_CACHE.values()),
+        "memory_size_bytes": IMAGE_CACHE.total_bytes,
         "filesystem_cached_images": fs_count,
         "filesystem_size_bytes": fs_size,
         "cache_directory": str(CACHE_DIR)
@@ -2,17 +2,92 @@
 LLM service for game generation using Cerebras via LiteLLM
 """
 import os
+import atexit
+import asyncio
 import time
-import json
 import hashlib
+import logging
+import orjson
+import threading
+import statistics
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import AsyncIterator, Deque, Dict, Any, Iterator, List, Mapping, Optional, Tuple
+import httpx
 import litellm
 from litellm import completion
+from models.game_data import GameData
+from services.http_client import HTTP_CLIENT
+from services.semantic_cache import get_semantic_cache
+from utils.json_stream import TopLevelMemberParser
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
 
 # Cache directory for LLM responses
 CACHE_DIR = Path(__file__).parent.parent / 'cache' / 'llm'
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+SEMANTIC_CACHE_DIR = CACHE_DIR / 'semantic'
+
+# Recently used games as compact JSON, in front of the disk cache
+MEM_CACHE_MAX = int(os.getenv('LLM_MEM_CACHE_ITEMS', '256'))
+_MEM_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_MEM_CACHE_STATS = {"hits": 0, "misses": 0}
+_MEM_CACHE_LOCK = threading.Lock()
+
+# Cached games are stored zstd-compressed when zstandard is installed
+_zstd_local = threading.local()
+
+# What a damaged cache file can raise on load (orjson errors are ValueErrors)
+_CACHE_READ_ERRORS = (OSError, ValueError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# Include version to invalidate old cache when prompt changes
+PROMPT_VERSION = "v4"  # Increment this when system prompt changes significantly
+
+# Text model (LiteLLM model string), read once at import like the settings below
+TEXT_MODEL = os.getenv('TEXT_MODEL', 'cerebras/llama-3.3-70b')
+
+# Deadline for one game generation attempt; a stalled call is abandoned and
+# retried instead of waiting on the HTTP client's much longer timeout
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT_SEC', '60'))
+
+# Longest gap allowed between streamed chunks, so a stream that stalls
+# mid-response fails fast instead of waiting for the next chunk to notice
+# the LLM_TIMEOUT deadline
+LLM_STREAM_READ_TIMEOUT = float(os.getenv('LLM_STREAM_READ_TIMEOUT_SEC', '15'))
+
+# Output budget: max_tokens is sized from the p95 of recent completion
+# lengths per difficulty (plus headroom) once enough samples exist
+MAX_TOKENS = 4000
+MAX_TOKENS_HEADROOM = 1.2
+MAX_TOKENS_MIN_SAMPLES = 20
+MAX_TOKENS_WINDOW = 200
+LENGTHS_FILE = CACHE_DIR / '_lengths.json'
+_OBSERVED_LENGTHS: Dict[str, Deque[int]] = {}
+_LENGTHS_LOCK = threading.Lock()
+
+# New lengths are written to LENGTHS_FILE every LENGTHS_FLUSH_SEC (and at
+# exit) by a background thread, not on every completion
+LENGTHS_FLUSH_SEC = 30
+_lengths_dirty = False
+_lengths_flusher = None
+
+# Open the pooled TLS connection to the text provider at startup
+LLM_WARMUP = os.getenv('LLM_WARMUP', '1') == '1'
+_LLM_WARMER: Optional[threading.Thread] = None
+_LLM_WARMER_LOCK = threading.Lock()
+
+# Generations currently running, keyed by difficulty + prompt, so concurrent
+# identical requests wait on one LLM call instead of each making their own
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
 
 
 # System prompt for game generation
@@ -40,41 +115,43 @@ Design Principles:
 Return ONLY valid JSON matching the exact schema provided. No markdown, no explanations."""
 
 
-def build_user_prompt(user_prompt: str, difficulty: str = "normal") -> str:
+# Per-difficulty stat ranges interpolated into the user prompt
+DIFFICULTY_PARAMS = MappingProxyType({
+    "easy": MappingProxyType({
+        "enemy_hp": "15-40",
+        "enemy_speed": "0.6-1.2",
+        "boss_hp": "800-1000",
+        "bullet_count": "3-8"
+    }),
+    "normal": MappingProxyType({
+        "enemy_hp": "20-60",
+        "enemy_speed": "0.8-2.0",
+        "boss_hp": "1000-1500",
+        "bullet_count": "5-15"
+    }),
+    "hard": MappingProxyType({
+        "enemy_hp": "40-100",
+        "enemy_speed": "1.2-3.0",
+        "boss_hp": "1500-2500",
+        "bullet_count": "10-32"
+    })
+})
+
+
+def render_user_prompt_prefix(params: Mapping[str, str]) -> str:
     """
-    Build user prompt for game generation
+    Render everything in the user prompt before the theme
+    
+    The theme goes last so the long fixed instructions stay a shared prompt
+    prefix that the provider can cache across requests.
     
     Args:
-        user_prompt: User's theme/concept
-        difficulty: easy, normal, or hard
-        
+        params: Stat ranges for one difficulty
+    
     Returns:
-        Formatted prompt string
+        Prompt text ending in "THEME: "
     """
-    difficulty_params = {
-        "easy": {
-            "enemy_hp": "15-40",
-            "enemy_speed": "0.6-1.2",
-            "boss_hp": "800-1000",
-            "bullet_count": "3-8"
-        },
-        "normal": {
-            "enemy_hp": "20-60",
-            "enemy_speed": "0.8-2.0",
-            "boss_hp": "1000-1500",
-            "bullet_count": "5-15"
-        },
-        "hard": {
-            "enemy_hp": "40-100",
-            "enemy_speed": "1.2-3.0",
-            "boss_hp": "1500-2500",
-            "bullet_count": "10-32"
-        }
-    }
-    
-    params = difficulty_params.get(difficulty, difficulty_params["normal"])
-    
-    return f"""Create a horizontal scrolling shmup based on this theme: {user_prompt}
+    return f"""Create a horizontal scrolling shmup based on the theme given at the end of this message.
 
 AESTHETIC DIRECTION: Create a cohesive visual style that matches the user's theme. Be creative and interpret the theme in interesting ways:
 
@@ -193,39 +270,441 @@ Generate a complete game JSON with these specifications:
    
    SAFEST: Just use null for tui_skin
 
-Return ONLY the JSON object. Ensure all IDs are unique and all references are valid."""
+Return ONLY the JSON object. Ensure all IDs are unique and all references are valid.
+
+THEME: """
+
+
+def render_schema_user_prompt_prefix(params: Mapping[str, str]) -> str:
+    """
+    Compact variant of render_user_prompt_prefix for json_schema mode
+    
+    Field names, types and hard limits come from the response schema, so
+    only the creative direction and the design targets (counts, difficulty
+    ranges, enums) are spelled out.
+    
+    Args:
+        params: Stat ranges for one difficulty
+    
+    Returns:
+        Prompt text ending in "THEME: "
+    """
+    return f"""Create a horizontal scrolling shmup based on the theme given at the end of this message, as JSON following the response schema.
+
+AESTHETIC: Interpret the theme creatively ("ocean" → bioluminescent sea creatures, coral reefs; "candy" → pastel whimsical desserts; "music" → instruments, sound waves) and keep os_name, tagline, palette and every sprite/parallax prompt consistent with it. Palettes are NOT limited to cyan/teal: try pastels, neons, earth tones, bright primaries.
+
+DESIGN TARGETS:
+- stages: exactly 1; scroll_speed 0.8-1.5; length_sec 180-300; 3 parallax layers at depth 0.3, 0.6, 0.9; 3 waves at time 3, 8, 15 with count 4-12, formation one of [v_wave, column, line, arc, circle, random], path one of [straight, sine, seek, arc, spiral]; boss with exactly 2 phases, hp {params['boss_hp']}, 2-3 pattern ids each
+- enemies: exactly 3; hp {params['enemy_hp']}; speed {params['enemy_speed']}; radius 8-16; score 50-500
+- bullet_patterns: 3-5; type one of [fan, burst, spiral, laser, aimed, stream, ring]; fan: bullets {params['bullet_count']}, spread_deg 20-90; burst: bullets {params['bullet_count']}, arc_deg 180-360; spiral: rate 0.05-0.15, dual
+- weapons: exactly 1; dps 100-150; projectile_speed 800-1000; spread 0-15; fire_rate 6-10
+- pickups: exactly 3; effect one of ["shield+1", "power+1", "bomb+1"]
+- tui_skin: null
+
+All IDs unique; wave enemy_type and boss phase patterns must reference existing ids.
+
+THEME: """
+
 
+# Constrain output to the GameData JSON Schema instead of describing every
+# field in the prompt (opt-in: not every provider/model supports json_schema).
+# Non-strict, since strict mode requires every property to be required and
+# GameData has optional/defaulted fields.
+USE_JSON_SCHEMA = os.getenv('LLM_JSON_SCHEMA', '0') == '1'
 
+if USE_JSON_SCHEMA:
+    RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {"name": "GameData", "schema": GameData.model_json_schema(), "strict": False}
+    }
+    _render_prefix = render_schema_user_prompt_prefix
+else:
+    RESPONSE_FORMAT = {"type": "json_object"}
+    _render_prefix = render_user_prompt_prefix
+
+# Rendered once at import; only the theme varies per request
+USER_PROMPT_PREFIXES = MappingProxyType({
+    difficulty: _render_prefix(params)
+    for difficulty, params in DIFFICULTY_PARAMS.items()
+})
+
+
+@lru_cache(maxsize=512)
+def build_user_prompt(user_prompt: str, difficulty: str = "normal") -> str:
+    """
+    Build user prompt for game generation
+    
+    Args:
+        user_prompt: User's theme/concept
+        difficulty: easy, normal, or hard
+    
+    Returns:
+        Formatted prompt string
+    """
+    return USER_PROMPT_PREFIXES.get(difficulty, USER_PROMPT_PREFIXES["normal"]) + user_prompt
+
+
+@lru_cache(maxsize=1024)
 def get_llm_cache_key(user_prompt: str, difficulty: str = None) -> str:
     """Generate cache key from user prompt only (difficulty is handled on frontend)"""
-    # Include version to invalidate old cache when prompt changes
-    PROMPT_VERSION = "v4"  # Increment this when system prompt changes significantly
     # Only use user_prompt for cache key - difficulty is applied on frontend
     key_str = f"{PROMPT_VERSION}:{user_prompt}"
     return hashlib.sha256(key_str.encode()).hexdigest()
 
 
+def _zstd_codecs():
+    """Per-thread (compressor, decompressor); zstandard objects aren't thread-safe"""
+    codecs = getattr(_zstd_local, 'codecs', None)
+    if codecs is None:
+        codecs = (zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor())
+        _zstd_local.codecs = codecs
+    return codecs
+
+
+def _remember_game(cache_key: str, game_json: bytes) -> None:
+    """Insert serialized game JSON into the in-memory LRU"""
+    with _MEM_CACHE_LOCK:
+        _MEM_CACHE[cache_key] = game_json
+        _MEM_CACHE.move_to_end(cache_key)
+        if len(_MEM_CACHE) > MEM_CACHE_MAX:
+            _MEM_CACHE.popitem(last=False)
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """In-memory LLM cache size and hit rate"""
+    with _MEM_CACHE_LOCK:
+        lookups = _MEM_CACHE_STATS["hits"] + _MEM_CACHE_STATS["misses"]
+        return {
+            "memory_cached_games": len(_MEM_CACHE),
+            "memory_hits": _MEM_CACHE_STATS["hits"],
+            "memory_misses": _MEM_CACHE_STATS["misses"],
+            "memory_hit_rate": _MEM_CACHE_STATS["hits"] / lookups if lookups else 0.0
+        }
+
+
 def load_from_llm_cache(cache_key: str) -> Optional[Dict[str, Any]]:
-    """Load cached LLM response"""
-    cache_file = CACHE_DIR / f"{cache_key}.json"
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️  Failed to load LLM cache: {e}")
-    return None
+    """Load cached LLM response (memory LRU, then zstd-compressed or legacy plain JSON)"""
+    with _MEM_CACHE_LOCK:
+        game_json = _MEM_CACHE.get(cache_key)
+        if game_json is not None:
+            _MEM_CACHE.move_to_end(cache_key)
+            _MEM_CACHE_STATS["hits"] += 1
+        else:
+            _MEM_CACHE_STATS["misses"] += 1
+    if game_json is not None:
+        # Parsed per hit so callers never share (and mutate) one dict
+        return orjson.loads(game_json)
+    
+    try:
+        if zstandard is not None:
+            try:
+                game_json = _zstd_codecs()[1].decompress((CACHE_DIR / f"{cache_key}.json.zst").read_bytes())
+            except FileNotFoundError:
+                pass
+        
+        if game_json is None:
+            try:
+                game_json = (CACHE_DIR / f"{cache_key}.json").read_bytes()
+            except FileNotFoundError:
+                return None
+        
+        game_data = orjson.loads(game_json)
+    except _CACHE_READ_ERRORS as e:
+        # Only files written before saves became atomic can be truncated
+        logger.warning(f"⚠️  Failed to load LLM cache: {e}")
+        return None
+    
+    _remember_game(cache_key, orjson.dumps(game_data))
+    return game_data
 
 
 def save_to_llm_cache(cache_key: str, game_data: Dict[str, Any]) -> None:
-    """Save LLM response to cache"""
-    cache_file = CACHE_DIR / f"{cache_key}.json"
+    """Save LLM response to cache (zstd-compressed when zstandard is installed)"""
+    game_json = orjson.dumps(game_data)
+    _remember_game(cache_key, game_json)
+    
+    if zstandard is not None:
+        cache_file = CACHE_DIR / f"{cache_key}.json.zst"
+        payload = _zstd_codecs()[0].compress(game_json)
+    else:
+        cache_file = CACHE_DIR / f"{cache_key}.json"
+        payload = orjson.dumps(game_data, option=orjson.OPT_INDENT_2)
+    
+    # Write then rename so a crash never leaves a truncated cache file; the
+    # per-process/thread tmp name means concurrent workers need no file lock
+    tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        with open(cache_file, 'w') as f:
-            json.dump(game_data, f, indent=2)
-        print(f"💾 Saved LLM response to cache: {cache_file.name}")
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, cache_file)
+        logger.info(f"💾 Saved LLM response to cache: {cache_file.name}")
     except Exception as e:
-        print(f"⚠️  Failed to save LLM cache: {e}")
+        tmp_file.unlink(missing_ok=True)
+        logger.warning(f"⚠️  Failed to save LLM cache: {e}")
+
+
+def check_llm_cache(cache_key: str, user_prompt: str) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[Any, Any]]]:
+    """
+    Look a prompt up in the exact and semantic LLM caches
+    
+    Args:
+        cache_key: Exact-match cache key for the prompt
+        user_prompt: User's theme/concept
+    
+    Returns:
+        Tuple of (cached game data or None, (semantic_cache, prompt_vector) to
+        index the prompt under after a miss, or None)
+    """
+    logger.debug("🔍 Checking LLM cache (key: %s...)", cache_key[:16])
+    
+    cached_data = load_from_llm_cache(cache_key)
+    if cached_data:
+        logger.info("✅ LLM cache HIT - using cached game data")
+        return cached_data, None
+    
+    # Near-duplicate prompts reuse an earlier game
+    semantic_entry = None
+    semantic_cache = get_semantic_cache(SEMANTIC_CACHE_DIR, PROMPT_VERSION)
+    if semantic_cache:
+        prompt_vector = semantic_cache.embed(user_prompt)
+        match = semantic_cache.search(prompt_vector)
+        if match:
+            cached_data = load_from_llm_cache(match[0])
+            if cached_data:
+                logger.info("✅ LLM semantic cache HIT (similarity %.3f) - using cached game data", match[1])
+                return cached_data, None
+        semantic_entry = (semantic_cache, prompt_vector)
+    
+    logger.info("❌ LLM cache MISS - generating new game data")
+    return None, semantic_entry
+
+
+def store_in_llm_cache(cache_key: str, game_data: Dict[str, Any], semantic_entry: Optional[Tuple[Any, Any]]) -> None:
+    """Save a generated game and index its prompt for semantic lookups"""
+    save_to_llm_cache(cache_key, game_data)
+    if semantic_entry:
+        semantic_cache, prompt_vector = semantic_entry
+        semantic_cache.add(prompt_vector, cache_key)
+
+
+def _load_observed_lengths() -> None:
+    """Restore recent completion lengths persisted by earlier runs"""
+    try:
+        saved = orjson.loads(LENGTHS_FILE.read_bytes())
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to load completion lengths: {e}")
+        return
+    for difficulty, lengths in saved.items():
+        _OBSERVED_LENGTHS[difficulty] = deque(lengths, maxlen=MAX_TOKENS_WINDOW)
+
+
+def get_max_tokens(difficulty: str) -> int:
+    """
+    max_tokens for a generation at this difficulty
+    
+    Returns:
+        p95 of recent completion lengths times MAX_TOKENS_HEADROOM, capped at
+        MAX_TOKENS; MAX_TOKENS until MAX_TOKENS_MIN_SAMPLES have been seen
+    """
+    with _LENGTHS_LOCK:
+        lengths = list(_OBSERVED_LENGTHS.get(difficulty, ()))
+    if len(lengths) < MAX_TOKENS_MIN_SAMPLES:
+        return MAX_TOKENS
+    p95 = statistics.quantiles(lengths, n=20)[18]
+    return min(MAX_TOKENS, int(p95 * MAX_TOKENS_HEADROOM))
+
+
+def record_completion_tokens(difficulty: str, usage: Any) -> None:
+    """
+    Record the completion length of a generation attempt
+    
+    Called for truncated or unparseable attempts too, so completions cut
+    off by the adaptive budget count as (at least) that long and the
+    budget can grow back instead of only ratcheting down.
+    """
+    global _lengths_dirty, _lengths_flusher
+    
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    if not completion_tokens:
+        return
+    
+    with _LENGTHS_LOCK:
+        _OBSERVED_LENGTHS.setdefault(difficulty, deque(maxlen=MAX_TOKENS_WINDOW)).append(completion_tokens)
+        _lengths_dirty = True
+        if _lengths_flusher is None:
+            _lengths_flusher = threading.Thread(target=_save_observed_lengths_forever, daemon=True)
+            _lengths_flusher.start()
+
+
+def save_observed_lengths() -> None:
+    """Write recorded completion lengths to LENGTHS_FILE if any are new"""
+    global _lengths_dirty
+    
+    with _LENGTHS_LOCK:
+        if not _lengths_dirty:
+            return
+        snapshot = {d: list(lengths) for d, lengths in _OBSERVED_LENGTHS.items()}
+        _lengths_dirty = False
+    
+    tmp_file = LENGTHS_FILE.with_name(f".{LENGTHS_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_file.write_bytes(orjson.dumps(snapshot))
+        os.replace(tmp_file, LENGTHS_FILE)
+    except Exception as e:
+        tmp_file.unlink(missing_ok=True)
+        logger.warning(f"⚠️  Failed to save completion lengths: {e}")
+
+
+def _save_observed_lengths_forever() -> None:
+    """Background loop for save_observed_lengths"""
+    while True:
+        time.sleep(LENGTHS_FLUSH_SEC)
+        save_observed_lengths()
+
+
+atexit.register(save_observed_lengths)
+_load_observed_lengths()
+
+
+def build_messages(user_prompt: str, difficulty: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a game generation call"""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_user_prompt(user_prompt, difficulty)}
+    ]
+
+
+def _stream_request(model: str, messages: List[Dict[str, str]], max_tokens: int) -> Dict[str, Any]:
+    """Completion arguments shared by the sync and async JSON streams"""
+    return dict(
+        model=model,
+        messages=messages,
+        temperature=0.8,
+        max_tokens=max_tokens,
+        response_format=RESPONSE_FORMAT,
+        stream=True,
+        stream_options={"include_usage": True},
+        # Bound each read as well as the whole attempt: a stalled stream
+        # raises after LLM_STREAM_READ_TIMEOUT without another chunk
+        timeout=httpx.Timeout(LLM_TIMEOUT, read=LLM_STREAM_READ_TIMEOUT)
+    )
+
+
+def stream_completion_members(
+    model: str,
+    messages: List[Dict[str, str]],
+    difficulty: str,
+    max_tokens: int = MAX_TOKENS
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a JSON completion, yielding each top-level member as soon as it closes
+    
+    Args:
+        model: LiteLLM model name
+        messages: Chat messages
+        difficulty: Difficulty the completion length is recorded under
+        max_tokens: Output token budget
+    
+    Yields:
+        (key, value) pairs such as ("story", {...}), ("player", {...})
+    
+    Raises:
+        orjson.JSONDecodeError: If the streamed response is not one JSON object
+    """
+    parser = TopLevelMemberParser()
+    usage = None
+    deadline = time.monotonic() + LLM_TIMEOUT
+    
+    try:
+        for chunk in completion(**_stream_request(model, messages, max_tokens)):
+            # Reads are bounded by LLM_STREAM_READ_TIMEOUT; also cap the whole stream
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"LLM stream exceeded {LLM_TIMEOUT:g}s")
+            usage = getattr(chunk, 'usage', None) or usage
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield from parser.feed(content)
+        
+        parser.close()
+    finally:
+        # Truncated (unparseable) completions are recorded as well
+        record_completion_tokens(difficulty, usage)
+
+
+async def astream_completion_members(
+    model: str,
+    messages: List[Dict[str, str]],
+    difficulty: str,
+    max_tokens: int = MAX_TOKENS
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Async version of stream_completion_members (litellm.acompletion)
+    
+    Same request and parser, so both paths accept and reject the same
+    responses; callers enforce the LLM_TIMEOUT deadline with wait_for.
+    """
+    parser = TopLevelMemberParser()
+    usage = None
+    
+    try:
+        async for chunk in await litellm.acompletion(**_stream_request(model, messages, max_tokens)):
+            usage = getattr(chunk, 'usage', None) or usage
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    for member in parser.feed(content):
+                        yield member
+        
+        parser.close()
+    finally:
+        # Truncated (unparseable) completions are recorded as well
+        record_completion_tokens(difficulty, usage)
+
+
+def stream_game_json(
+    user_prompt: str,
+    difficulty: str = "normal",
+    use_cache: bool = True
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Generate game JSON, yielding top-level sections as the LLM emits them
+    
+    Cache hits are replayed section by section. Unlike generate_game_json
+    there are no retries, since sections may already have been consumed.
+    
+    Args:
+        user_prompt: User's theme/concept
+        difficulty: easy, normal, or hard
+        use_cache: Whether to use cache
+    
+    Yields:
+        (key, value) pairs in response order
+    """
+    cache_key = get_llm_cache_key(user_prompt) if use_cache else None
+    
+    semantic_entry = None
+    
+    if use_cache and cache_key:
+        cached_data, semantic_entry = check_llm_cache(cache_key, user_prompt)
+        if cached_data:
+            yield from cached_data.items()
+            return
+    
+    model = TEXT_MODEL
+    logger.info(f"🤖 Streaming {model}...")
+    
+    game_data = {}
+    messages = build_messages(user_prompt, difficulty)
+    for key, value in stream_completion_members(model, messages, difficulty, get_max_tokens(difficulty)):
+        game_data[key] = value
+        yield key, value
+    
+    logger.info("✅ Successfully generated game data")
+    
+    if use_cache and cache_key:
+        store_in_llm_cache(cache_key, game_data, semantic_entry)
 
 
 def generate_game_json(
@@ -242,75 +721,60 @@ def generate_game_json(
         difficulty: easy, normal, or hard
         max_retries: Maximum retry attempts
         use_cache: Whether to use cache
-        
+    
     Returns:
         Tuple of (success, game_data_dict, error_message)
     """
     # Generate cache key (always, even if not using cache)
     cache_key = get_llm_cache_key(user_prompt) if use_cache else None
     
+    semantic_entry = None
+    
     # Check cache first
     if use_cache and cache_key:
-        print(f"🔍 Checking LLM cache (key: {cache_key[:16]}...)")
-        
-        cached_data = load_from_llm_cache(cache_key)
+        cached_data, semantic_entry = check_llm_cache(cache_key, user_prompt)
         if cached_data:
-            print(f"✅ LLM cache HIT - using cached game data")
             return True, cached_data, None
-        
-        print(f"❌ LLM cache MISS - generating new game data")
-    
-    model = os.getenv('TEXT_MODEL', 'cerebras/llama-3.3-70b')
     
-    messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "user", "content": build_user_prompt(user_prompt, difficulty)}
-    ]
+    model = TEXT_MODEL
+    messages = build_messages(user_prompt, difficulty)
     
     for attempt in range(max_retries):
         try:
-            print(f"🤖 Calling {model} (attempt {attempt + 1}/{max_retries})...")
+            logger.info(f"🤖 Calling {model} (attempt {attempt + 1}/{max_retries})...")
             
-            response = completion(
-                model=model,
-                messages=messages,
-                temperature=0.8,
-                max_tokens=4000,
-                response_format={"type": "json_object"}
-            )
-            
-            # Extract JSON from response
-            content = response.choices[0].message.content
+            # Retries get the full budget in case the adaptive one truncated
+            max_tokens = get_max_tokens(difficulty) if attempt == 0 else MAX_TOKENS
             
-            # Parse JSON
-            game_data = json.loads(content)
+            # Stream the response so sections are parsed while later ones arrive
+            game_data = dict(stream_completion_members(model, messages, difficulty, max_tokens))
             
-            print(f"✅ Successfully generated game data")
+            logger.info("✅ Successfully generated game data")
             
             # Save to cache
             if use_cache and cache_key:
-                save_to_llm_cache(cache_key, game_data)
+                store_in_llm_cache(cache_key, game_data, semantic_entry)
             
             return True, game_data, None
-            
-        except json.JSONDecodeError as e:
+        
+        except orjson.JSONDecodeError as e:
             error_msg = f"JSON parsing error: {str(e)}"
-            print(f"⚠️  {error_msg}")
+            logger.warning(f"⚠️  {error_msg}")
             
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                print(f"   Retrying in {wait_time}s...")
+                logger.info(f"   Retrying in {wait_time}s...")
                 time.sleep(wait_time)
             else:
                 return False, None, error_msg
-                
+        
         except Exception as e:
             error_msg = f"LLM error: {type(e).__name__}: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error(f"❌ {error_msg}")
             
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt
-                print(f"   Retrying in {wait_time}s...")
+                logger.info(f"   Retrying in {wait_time}s...")
                 time.sleep(wait_time)
             else:
                 return False, None, error_msg
@@ -318,6 +782,358 @@ def generate_game_json(
     return False, None, "Max retries exceeded"
 
 
+async def _collect_members(members: AsyncIterator[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Gather a streamed completion's top-level members into one dict"""
+    return {key: value async for key, value in members}
+
+
+async def agenerate_game_json(
+    user_prompt: str,
+    difficulty: str = "normal",
+    max_retries: int = 3,
+    use_cache: bool = True
+) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Async version of generate_game_json (litellm.acompletion, non-blocking backoff)
+    
+    Cache reads/writes and prompt embedding run in a worker thread so they
+    don't stall the event loop.
+    """
+    cache_key = get_llm_cache_key(user_prompt) if use_cache else None
+    
+    semantic_entry = None
+    
+    if use_cache and cache_key:
+        cached_data, semantic_entry = await asyncio.to_thread(check_llm_cache, cache_key, user_prompt)
+        if cached_data:
+            return True, cached_data, None
+    
+    model = TEXT_MODEL
+    messages = build_messages(user_prompt, difficulty)
+    
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"🤖 Calling {model} (attempt {attempt + 1}/{max_retries})...")
+            
+            # Retries get the full budget in case the adaptive one truncated
+            max_tokens = get_max_tokens(difficulty) if attempt == 0 else MAX_TOKENS
+            
+            # Same streaming parser as the sync path, under one overall deadline
+            game_data = await asyncio.wait_for(
+                _collect_members(astream_completion_members(model, messages, difficulty, max_tokens)),
+                timeout=LLM_TIMEOUT
+            )
+            
+            logger.info("✅ Successfully generated game data")
+            
+            if use_cache and cache_key:
+                await asyncio.to_thread(store_in_llm_cache, cache_key, game_data, semantic_entry)
+            
+            return True, game_data, None
+        
+        except orjson.JSONDecodeError as e:
+            error_msg = f"JSON parsing error: {str(e)}"
+        except asyncio.TimeoutError:
+            error_msg = f"LLM error: TimeoutError: no response within {LLM_TIMEOUT:g}s"
+        except Exception as e:
+            error_msg = f"LLM error: {type(e).__name__}: {str(e)}"
+        
+        logger.warning(f"⚠️  {error_msg}")
+        if attempt < max_retries - 1:
+            wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+            logger.info(f"   Retrying in {wait_time}s...")
+            await asyncio.sleep(wait_time)
+        else:
+            return False, None, error_msg
+    
+    return False, None, "Max retries exceeded"
+
+
+async def generate_games_batch(
+    prompts: List[str],
+    difficulty: str = "normal",
+    concurrency: int = 8
+) -> List[Tuple[bool, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Generate several games concurrently
+    
+    Args:
+        prompts: User themes/concepts
+        difficulty: easy, normal, or hard
+        concurrency: Max LLM calls in flight at once
+    
+    Returns:
+        List of (success, game_data_dict, error_message) in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def generate_one(user_prompt: str):
+        async with semaphore:
+            return await agenerate_game_json(user_prompt, difficulty)
+    
+    outcomes = await asyncio.gather(*(generate_one(p) for p in prompts), return_exceptions=True)
+    
+    return [
+        (False, None, f"{type(outcome).__name__}: {str(outcome)}") if isinstance(outcome, Exception) else outcome
+        for outcome in outcomes
+    ]
+
+
+def get_variant_cache_key(cache_key: str, index: int) -> str:
+    """Cache key of the index-th variant generated for a prompt"""
+    return f"{cache_key}_v{index}"
+
+
+def _variant_request(model: str, messages: List[Dict[str, str]], max_tokens: int) -> Dict[str, Any]:
+    """Completion arguments shared by every variant call"""
+    return dict(
+        model=model,
+        messages=messages,
+        temperature=0.8,
+        max_tokens=max_tokens,
+        response_format=RESPONSE_FORMAT
+    )
+
+
+def _load_cached_variants(cache_key: str, k: int) -> Optional[List[Dict[str, Any]]]:
+    """All k cached variants for a prompt, or None if any is missing"""
+    cached = [load_from_llm_cache(get_variant_cache_key(cache_key, i)) for i in range(k)]
+    if all(cached):
+        logger.info(f"💾 Using {k} cached variants (key: {cache_key[:16]}...)")
+        return cached
+    return None
+
+
+def _save_variants(cache_key: str, games: List[Dict[str, Any]]):
+    """Cache each generated variant under its own key"""
+    for i, game_data in enumerate(games):
+        save_to_llm_cache(get_variant_cache_key(cache_key, i), game_data)
+
+
+def _parse_variants(responses: List[Any], k: int) -> Tuple[bool, List[Dict[str, Any]], Optional[str]]:
+    """Parse up to k games out of completion responses (or their exceptions)"""
+    games = []
+    errors = []
+    for response in responses:
+        if isinstance(response, Exception):
+            errors.append(f"LLM error: {type(response).__name__}: {str(response)}")
+            continue
+        for choice in response.choices:
+            try:
+                games.append(orjson.loads(choice.message.content))
+            except orjson.JSONDecodeError as e:
+                errors.append(f"JSON parsing error: {str(e)}")
+    
+    games = games[:k]
+    if not games:
+        return False, [], "; ".join(errors) or "No variants returned"
+    
+    logger.info(f"✅ Generated {len(games)}/{k} game variants")
+    return True, games, None
+
+
+def _generate_variants_threaded(model: str, messages: List[Dict[str, str]], k: int, max_tokens: int) -> List[Any]:
+    """Fallback for providers without n>1: k single completions on worker threads"""
+    request = _variant_request(model, messages, max_tokens)
+    with ThreadPoolExecutor(max_workers=k) as executor:
+        futures = [executor.submit(completion, **request) for _ in range(k)]
+    
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+async def _agenerate_variants(model: str, messages: List[Dict[str, str]], k: int, max_tokens: int) -> List[Any]:
+    """Fallback for providers without n>1: k concurrent single completions"""
+    request = _variant_request(model, messages, max_tokens)
+    return await asyncio.gather(*(
+        litellm.acompletion(**request) for _ in range(k)
+    ), return_exceptions=True)
+
+
+def generate_game_variants(
+    user_prompt: str,
+    k: int = 4,
+    difficulty: str = "normal",
+    use_cache: bool = True
+) -> Tuple[bool, List[Dict[str, Any]], Optional[str]]:
+    """
+    Generate k independent games for one prompt in a single LLM call
+    
+    Uses n=k so the prompt prefill is paid once. Providers that reject n>1
+    (or return fewer choices) are topped up with single calls on worker
+    threads. Code running on an event loop should await
+    agenerate_game_variants instead.
+    
+    Args:
+        user_prompt: User's theme/concept
+        k: Number of variants
+        difficulty: easy, normal, or hard
+        use_cache: Whether to use cache
+    
+    Returns:
+        Tuple of (success, list_of_game_data_dicts, error_message)
+    """
+    cache_key = get_llm_cache_key(user_prompt) if use_cache else None
+    
+    if use_cache and cache_key:
+        cached = _load_cached_variants(cache_key, k)
+        if cached:
+            return True, cached, None
+    
+    model = TEXT_MODEL
+    messages = build_messages(user_prompt, difficulty)
+    
+    max_tokens = get_max_tokens(difficulty)
+    
+    responses: List[Any] = []
+    try:
+        logger.info(f"🤖 Calling {model} for {k} variants...")
+        response = completion(**_variant_request(model, messages, max_tokens), n=k)
+        responses.append(response)
+        received = len(response.choices)
+    except (litellm.UnsupportedParamsError, litellm.BadRequestError) as e:
+        logger.warning(f"⚠️  {model} rejected n={k} ({type(e).__name__}), falling back to parallel calls")
+        received = 0
+    except Exception as e:
+        return False, [], f"LLM error: {type(e).__name__}: {str(e)}"
+    
+    if received < k:
+        responses.extend(_generate_variants_threaded(model, messages, k - received, max_tokens))
+    
+    success, games, error = _parse_variants(responses, k)
+    
+    if success and use_cache and cache_key:
+        _save_variants(cache_key, games)
+    
+    return success, games, error
+
+
+async def agenerate_game_variants(
+    user_prompt: str,
+    k: int = 4,
+    difficulty: str = "normal",
+    use_cache: bool = True
+) -> Tuple[bool, List[Dict[str, Any]], Optional[str]]:
+    """
+    Async version of generate_game_variants (litellm.acompletion)
+    
+    The n>1 fallback runs as concurrent acompletion calls, and cache reads
+    and writes run in a worker thread so they don't stall the event loop.
+    """
+    cache_key = get_llm_cache_key(user_prompt) if use_cache else None
+    
+    if use_cache and cache_key:
+        cached = await asyncio.to_thread(_load_cached_variants, cache_key, k)
+        if cached:
+            return True, cached, None
+    
+    model = TEXT_MODEL
+    messages = build_messages(user_prompt, difficulty)
+    
+    max_tokens = get_max_tokens(difficulty)
+    
+    responses: List[Any] = []
+    try:
+        logger.info(f"🤖 Calling {model} for {k} variants...")
+        response = await litellm.acompletion(**_variant_request(model, messages, max_tokens), n=k)
+        responses.append(response)
+        received = len(response.choices)
+    except (litellm.UnsupportedParamsError, litellm.BadRequestError) as e:
+        logger.warning(f"⚠️  {model} rejected n={k} ({type(e).__name__}), falling back to parallel calls")
+        received = 0
+    except Exception as e:
+        return False, [], f"LLM error: {type(e).__name__}: {str(e)}"
+    
+    if received < k:
+        responses.extend(await _agenerate_variants(model, messages, k - received, max_tokens))
+    
+    success, games, error = _parse_variants(responses, k)
+    
+    if success and use_cache and cache_key:
+        await asyncio.to_thread(_save_variants, cache_key, games)
+    
+    return success, games, error
+
+
+def generate_game_json_coalesced(
+    user_prompt: str,
+    difficulty: str = "normal"
+) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Generate game JSON, sharing one call between concurrent identical requests
+    
+    Args:
+        user_prompt: User's theme/concept
+        difficulty: easy, normal, or hard
+    
+    Returns:
+        Tuple of (success, game_data_dict, error_message)
+    """
+    key = hashlib.blake2b(f"{difficulty}|{user_prompt}".encode(), digest_size=16).hexdigest()
+    
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _INFLIGHT[key] = future
+    
+    if not is_owner:
+        logger.info(f"🔗 Joining in-flight generation (key: {key[:16]}...)")
+        return future.result()
+    
+    try:
+        result = generate_game_json(user_prompt, difficulty)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def warm_llm_connection() -> bool:
+    """
+    Prime the shared HTTP pool with a connection to the text provider
+    
+    Makes an unauthenticated GET to the provider's /models endpoint; any
+    response (401 included) leaves a keep-alive TLS connection in the pool
+    for the first real completion. No tokens are spent.
+    
+    Returns:
+        True if a connection was opened
+    """
+    model = TEXT_MODEL
+    try:
+        api_base = litellm.get_llm_provider(model)[3]
+        if not api_base:
+            return False
+        HTTP_CLIENT.get(f"{api_base.rstrip('/')}/models", timeout=10.0)
+        logger.info(f"🔌 Warmed connection to {api_base}")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️  LLM connection warmup failed: {type(e).__name__}: {str(e)}")
+        return False
+
+
+def start_llm_warmup() -> Optional[threading.Thread]:
+    """Run warm_llm_connection once per process on a background thread"""
+    global _LLM_WARMER
+    with _LLM_WARMER_LOCK:
+        if _LLM_WARMER is not None or not LLM_WARMUP:
+            return None
+        _LLM_WARMER = threading.Thread(target=warm_llm_connection, name="llm-connection-warmer", daemon=True)
+        _LLM_WARMER.start()
+        return _LLM_WARMER
+
+
 def test_llm_connection() -> Tuple[bool, Optional[str]]:
     """
     Test LLM connection with a simple prompt
@@ -325,7 +1141,7 @@ def test_llm_connection() -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (success, error_message)
     """
-    model = os.getenv('TEXT_MODEL', 'cerebras/llama-3.3-70b')
+    model = TEXT_MODEL
     
     try:
         response = completion(
@@ -336,6 +1152,6 @@ def test_llm_connection() -> Tuple[bool, Optional[str]]:
         
         content = response.choices[0].message.content
         return True, None
-        
+    
     except Exception as e:
         return False, f"{type(e).__name__}: {str(e)}"
@@ -0,0 +1,150 @@
+"""
+Semantic cache for generated games
+
+Near-duplicate prompts ("space pirates" / "pirates in space") reuse a cached
+game instead of making a new LLM call. Prompts are embedded with a small local
+sentence-transformers model and matched by cosine similarity (inner product of
+normalized vectors) against every previously generated prompt.
+
+sentence-transformers is optional; without it the semantic cache is disabled
+and only exact prompt matches hit the LLM cache.
+"""
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+import orjson
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE', '1') == '1'
+SEMANTIC_CACHE_MODEL = os.getenv('SEMANTIC_CACHE_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+
+
+class SemanticCache:
+    """Embedding index mapping prompts to LLM cache keys"""
+    
+    def __init__(self, directory: Path, model_name: str, threshold: float, namespace: str):
+        """
+        Args:
+            directory: Where embeddings.npy and keys.json are stored
+            model_name: sentence-transformers model to embed prompts with
+            threshold: Minimum cosine similarity for a hit
+            namespace: Prompt version; an index built for another version is discarded
+        """
+        from sentence_transformers import SentenceTransformer
+        
+        self.directory = directory
+        self.threshold = threshold
+        self.namespace = namespace
+        self.model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._vectors = np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        self._load()
+    
+    def _load(self):
+        """Load the index from disk (embeddings are memory-mapped)"""
+        try:
+            meta = orjson.loads((self.directory / 'keys.json').read_bytes())
+            vectors = np.load(self.directory / 'embeddings.npy', mmap_mode='r')
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to load semantic cache: {e}")
+            return
+        
+        if meta.get('namespace') != self.namespace or len(meta['keys']) != len(vectors) \
+                or vectors.shape[1] != self._vectors.shape[1]:
+            logger.info("🔄 Semantic cache built for another prompt version or model, starting fresh")
+            return
+        
+        self._keys = meta['keys']
+        self._vectors = vectors
+        logger.info(f"🧠 Semantic cache loaded ({len(self._keys)} prompts)")
+    
+    def _save(self):
+        """Write the index to disk atomically"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        vectors_tmp = self.directory / f"embeddings.npy{suffix}"
+        with open(vectors_tmp, 'wb') as f:
+            np.save(f, self._vectors)
+        os.replace(vectors_tmp, self.directory / 'embeddings.npy')
+        
+        keys_tmp = self.directory / f"keys.json{suffix}"
+        keys_tmp.write_bytes(orjson.dumps({"namespace": self.namespace, "keys": self._keys}))
+        os.replace(keys_tmp, self.directory / 'keys.json')
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Return the L2-normalized embedding of a prompt"""
+        return self.model.encode([text], normalize_embeddings=True, convert_to_numpy=True)[0].astype(np.float32)
+    
+    def search(self, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar cached prompt
+        
+        Args:
+            vector: Normalized prompt embedding
+        
+        Returns:
+            (cache_key, similarity) if above the threshold, None otherwise
+        """
+        with self._lock:
+            if not self._keys:
+                return None
+            scores = self._vectors @ vector
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            if score < self.threshold:
+                return None
+            return self._keys[best], score
+    
+    def add(self, vector: np.ndarray, cache_key: str):
+        """Index a newly cached prompt"""
+        with self._lock:
+            if cache_key in self._keys:
+                return
+            self._vectors = np.vstack([self._vectors, vector[np.newaxis, :]])
+            self._keys = self._keys + [cache_key]
+            try:
+                self._save()
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to save semantic cache: {e}")
+
+
+_SEMANTIC_CACHE: Optional[SemanticCache] = None
+_SEMANTIC_CACHE_FAILED = False
+_SEMANTIC_CACHE_LOCK = threading.Lock()
+
+
+def get_semantic_cache(directory: Path, namespace: str) -> Optional[SemanticCache]:
+    """
+    Return the shared semantic cache, loading the embedding model on first use
+    
+    Args:
+        directory: Index directory
+        namespace: Prompt version the cached games were generated with
+    
+    Returns:
+        SemanticCache, or None if disabled or sentence-transformers is missing
+    """
+    global _SEMANTIC_CACHE, _SEMANTIC_CACHE_FAILED
+    if not SEMANTIC_CACHE_ENABLED or _SEMANTIC_CACHE_FAILED:
+        return None
+    
+    with _SEMANTIC_CACHE_LOCK:
+        if _SEMANTIC_CACHE is None and not _SEMANTIC_CACHE_FAILED:
+            try:
+                _SEMANTIC_CACHE = SemanticCache(directory, SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, namespace)
+            except ImportError:
+                logger.info("ℹ️  sentence-transformers not installed, semantic LLM cache disabled")
+                _SEMANTIC_CACHE_FAILED = True
+            except Exception as e:
+                logger.warning(f"⚠️  Semantic cache unavailable: {e}")
+                _SEMANTIC_CACHE_FAILED = True
+        return _SEMANTIC_CACHE
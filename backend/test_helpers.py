@@ -0,0 +1,43 @@
+"""
+Helpers shared by the step validation scripts (test_step3/4/5.py)
+"""
+import asyncio
+
+_HTTP_SESSION = None
+
+
+def get_http_session():
+    """Shared requests session so the endpoint tests reuse one keep-alive connection"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        import requests
+        _HTTP_SESSION = requests.Session()
+    return _HTTP_SESSION
+
+
+async def prefetch_calls(calls, run_call, concurrency: int, key=None):
+    """
+    Run independent test calls concurrently, at most `concurrency` at a time
+    
+    Args:
+        calls: Argument tuples, one per call
+        run_call: Coroutine function taking one call's arguments
+        concurrency: Max calls in flight at once
+        key: Maps a call's arguments to its result key (default: the tuple)
+    
+    Returns:
+        Dict of results keyed per call; calls that raised are left out so
+        the tests make them again and report the error themselves
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run_one(call):
+        async with semaphore:
+            return await run_call(*call)
+    
+    results = await asyncio.gather(*(run_one(call) for call in calls), return_exceptions=True)
+    return {
+        (key(*call) if key else call): result
+        for call, result in zip(calls, results)
+        if not isinstance(result, Exception)
+    }
@@ -11,7 +11,7 @@ echo "📡 Testing /health endpoint..."
 HEALTH=$(curl -s http://localhost:5006/health)
 echo "Response: $HEALTH"
 
-if echo "$HEALTH" | grep -q '"ok": true'; then
+if echo "$HEALTH" | grep -qE '"ok": ?true'; then
     echo "✅ Health check passed"
 else
     echo "❌ Health check failed"
@@ -23,7 +23,7 @@ echo "📋 Testing /api/version endpoint..."
 VERSION=$(curl -s http://localhost:5006/api/version)
 echo "Response: $VERSION"
 
-if echo "$VERSION" | grep -q '"service": "fantasy-os-shmup"'; then
+if echo "$VERSION" | grep -qE '"service": ?"fantasy-os-shmup"'; then
     echo "✅ Version check passed"
 else
     echo "❌ Version check failed"
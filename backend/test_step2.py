@@ -5,14 +5,34 @@ Tests Pydantic schema validation and utility functions
 """
 import sys
 import copy
+import orjson
+from pydantic import ValidationError
 from models.game_data import GameData, SAMPLE_GAME_DATA
+from models.requests import GenerateSpritesRequest, GenerateTexturesRequest, SaveGameRequest
 from utils.validation import (
     validate_game_data,
     validate_partial_game_data,
-    get_validation_summary
+    get_validation_summary,
+    dump_game_json
 )
 
 
+def _patched_sample(path: tuple, value):
+    """
+    SAMPLE_GAME_DATA with the value at path replaced
+    
+    Only the dicts/lists along path are (shallow) copied; everything else
+    is shared with the sample, which validation never mutates.
+    """
+    data = copy.copy(SAMPLE_GAME_DATA)
+    node = data
+    for key in path[:-1]:
+        node[key] = copy.copy(node[key])
+        node = node[key]
+    node[path[-1]] = value
+    return data
+
+
 def test_valid_sample_data():
     """Test 1: Validate sample game data"""
     print("🧪 Test 1: Validating sample game data...")
@@ -64,8 +84,7 @@ def test_invalid_palette():
     """Test 3: Reject invalid color palette"""
     print("\n🧪 Test 3: Testing invalid color palette...")
     
-    invalid_data = copy.deepcopy(SAMPLE_GAME_DATA)
-    invalid_data['story'] = {
+    invalid_data = _patched_sample(('story',), {
         "os_name": "Test",
         "tagline": "Test",
         "palette": {
@@ -73,7 +92,7 @@ def test_invalid_palette():
             "ansi_bg": "#06080A",
             "accent": "#8AE6FF"
         }
-    }
+    })
     
     is_valid, _, error = validate_game_data(invalid_data)
     
@@ -95,8 +114,7 @@ def test_invalid_wave_formation():
     """Test 4: Reject invalid wave formation"""
     print("\n🧪 Test 4: Testing invalid wave formation...")
     
-    invalid_data = copy.deepcopy(SAMPLE_GAME_DATA)
-    invalid_data['stages'][0]['waves'][0]['formation'] = 'invalid_formation'
+    invalid_data = _patched_sample(('stages', 0, 'waves', 0, 'formation'), 'invalid_formation')
     
     is_valid, _, error = validate_game_data(invalid_data)
     
@@ -116,8 +134,9 @@ def test_missing_required_field():
     """Test 5: Reject missing required fields"""
     print("\n🧪 Test 5: Testing missing required field...")
     
-    invalid_data = copy.deepcopy(SAMPLE_GAME_DATA)
-    del invalid_data['story']['os_name']  # Remove required field
+    # Remove required field
+    story = {k: v for k, v in SAMPLE_GAME_DATA['story'].items() if k != 'os_name'}
+    invalid_data = _patched_sample(('story',), story)
     
     is_valid, _, error = validate_game_data(invalid_data)
     
@@ -138,8 +157,7 @@ def test_range_validation():
     print("\n🧪 Test 6: Testing numeric range validation...")
     
     # Test HP out of range
-    invalid_data = copy.deepcopy(SAMPLE_GAME_DATA)
-    invalid_data['enemies'][0]['hp'] = 10000  # Max is 1000
+    invalid_data = _patched_sample(('enemies', 0, 'hp'), 10000)  # Max is 1000
     
     is_valid, _, error = validate_game_data(invalid_data)
     
@@ -156,8 +174,8 @@ def test_unique_ids():
     print("\n🧪 Test 7: Testing unique ID validation...")
     
     # Duplicate enemy IDs
-    invalid_data = copy.deepcopy(SAMPLE_GAME_DATA)
-    invalid_data['enemies'].append(copy.deepcopy(invalid_data['enemies'][0]))
+    enemies = SAMPLE_GAME_DATA['enemies']
+    invalid_data = _patched_sample(('enemies',), enemies + [enemies[0]])
     
     is_valid, _, error = validate_game_data(invalid_data)
     
@@ -202,7 +220,7 @@ def test_direct_model_instantiation():
     print("\n🧪 Test 9: Testing direct model instantiation...")
     
     try:
-        game_data = GameData(**SAMPLE_GAME_DATA)
+        game_data = GameData.model_validate(SAMPLE_GAME_DATA)
         
         # Test model properties
         if game_data.story.os_name != "FantasyOS-Δ9":
@@ -232,10 +250,10 @@ def test_json_serialization():
     print("\n🧪 Test 10: Testing JSON serialization...")
     
     try:
-        game_data = GameData(**SAMPLE_GAME_DATA)
+        game_data = GameData.model_validate(SAMPLE_GAME_DATA)
         
-        # Test model_dump_json
-        json_str = game_data.model_dump_json(indent=2)
+        # Test JSON dump
+        json_str = dump_game_json(game_data, indent=2).decode()
         
         if not json_str:
             print("❌ FAILED: JSON serialization produced empty string")
@@ -248,7 +266,7 @@ def test_json_serialization():
         # Test round-trip
         import json
         parsed = json.loads(json_str)
-        game_data_2 = GameData(**parsed)
+        game_data_2 = GameData.model_validate(parsed)
         
         if game_data.story.os_name != game_data_2.story.os_name:
             print("❌ FAILED: Round-trip data mismatch")
@@ -263,6 +281,71 @@ def test_json_serialization():
         return False
 
 
+def test_raw_json_validation():
+    """Test 11: Validate straight from JSON bytes"""
+    print("\n🧪 Test 11: Testing raw JSON validation...")
+    
+    raw_json = orjson.dumps(SAMPLE_GAME_DATA)
+    dict_result = validate_game_data(SAMPLE_GAME_DATA)
+    raw_result = validate_game_data(None, raw_json=raw_json)
+    
+    if raw_result[0] != dict_result[0] or raw_result[2] != dict_result[2]:
+        print("❌ FAILED: Raw JSON and dict validation disagree")
+        print(f"   Dict: {dict_result[2]}")
+        print(f"   Raw: {raw_result[2]}")
+        return False
+    
+    invalid_json = raw_json.replace(b'"hp":', b'"hp":"lots","x":', 1)
+    is_valid, _, error = validate_game_data(None, raw_json=invalid_json)
+    if is_valid or "hp" not in error:
+        print("❌ FAILED: Invalid raw JSON was accepted")
+        return False
+    
+    print("✅ PASSED: Raw JSON validation matches dict validation")
+    return True
+
+
+def test_legacy_request_payloads():
+    """Test 12: Request bodies clients sent before the request models still validate"""
+    print("\n🧪 Test 12: Testing legacy request payload shapes...")
+    
+    # Explicit nulls used to fall back to the route's data.get(...) defaults
+    textures = GenerateTexturesRequest.model_validate_json(
+        b'{"game_id": null, "theme": null, "color": null, "tui_frame_prompt": null,'
+        b' "parallax_layers": [{"id": "far", "prompt": "ribs", "depth": null}], "tui_frames": null}'
+    )
+    if textures.color != '#00FFD1' or textures.theme != '' or textures.parallax_layers[0].depth != 0.5 or textures.tui_frames != []:
+        print(f"❌ FAILED: Null texture fields not defaulted: {textures}")
+        return False
+    
+    sprites = GenerateSpritesRequest.model_validate_json(
+        b'{"color": null, "player": null, "enemies": null, "bosses": [{"id": "b1", "sprite_prompt": "daemon"}]}'
+    )
+    if sprites.color != '#00FFD1' or sprites.player is not None or sprites.enemies != []:
+        print(f"❌ FAILED: Null sprite fields not defaulted: {sprites}")
+        return False
+    
+    save = SaveGameRequest.model_validate_json(
+        b'{"player_id": "p1", "game_id": "g1", "campaign_id": null, "stage_num": null, "completed": null,'
+        b' "difficulty": null, "player_stats": {"score": 1200, "lives": null, "time_sec": 93.5}}'
+    )
+    stats = save.player_stats.model_dump()
+    if save.stage_num != 0 or save.completed or save.difficulty != 'normal' or stats['lives'] != 3 or stats['time_sec'] != 93.5:
+        print(f"❌ FAILED: Legacy save payload changed: {save}")
+        return False
+    
+    # Required fields are still required
+    try:
+        SaveGameRequest.model_validate({"player_id": "p1", "game_id": None})
+        print("❌ FAILED: Null game_id was accepted")
+        return False
+    except ValidationError:
+        pass
+    
+    print("✅ PASSED: Legacy payloads validate with their old defaults")
+    return True
+
+
 def run_all_tests():
     """Run all validation tests"""
     print("=" * 60)
@@ -279,7 +362,9 @@ def run_all_tests():
         test_unique_ids,
         test_partial_validation,
         test_direct_model_instantiation,
-        test_json_serialization
+        test_json_serialization,
+        test_raw_json_validation,
+        test_legacy_request_payloads
     ]
     
     passed = 0
@@ -5,6 +5,8 @@ Tests image generation service
 """
 import sys
 import os
+import orjson
+import asyncio
 from services.image_service import (
     generate_image,
     generate_parallax_layer,
@@ -14,6 +16,44 @@ from services.image_service import (
     get_cache_stats,
     clear_cache
 )
+from test_helpers import get_http_session, prefetch_calls
+
+
+# Max concurrent image calls while prefetching
+PREFETCH_CONCURRENCY = 4
+
+# (function, args, kwargs) of the independent image generations in tests 2-6;
+# test 7 runs live since it depends on cache state
+IMAGE_CALLS = [
+    (generate_image, ("A simple biomechanical test pattern",), {"size": "1024x1024", "use_cache": False}),
+    (generate_parallax_layer, ("biomechanical cathedral", "ribbed organic tunnel with pulsing veins", 0.5), {}),
+    (generate_enemy_sprite, ("small biomechanical drone with glowing core",), {}),
+    (generate_boss_sprite, ("massive biomechanical daemon with multiple eyes",), {}),
+    (generate_tui_frame, ("terminal bezel with giger filigree corners",), {})
+]
+
+_PREFETCHED = {}
+
+
+def _call_key(func, args, kwargs):
+    """Hashable identity of one generator call"""
+    return func.__name__, args, tuple(sorted(kwargs.items()))
+
+
+async def prefetch_images(calls, concurrency: int = PREFETCH_CONCURRENCY):
+    """Run the tests' image calls concurrently in worker threads"""
+    async def generate_one(func, args, kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    _PREFETCHED.update(await prefetch_calls(calls, generate_one, concurrency, key=_call_key))
+
+
+def generate(func, *args, **kwargs):
+    """Call an image generator, served from the prefetched results when available"""
+    result = _PREFETCHED.pop(_call_key(func, args, kwargs), None)
+    if result is None:
+        result = func(*args, **kwargs)
+    return result
 
 
 def test_gemini_configuration():
@@ -38,7 +78,7 @@ def test_generate_simple_image():
     
     prompt = "A simple biomechanical test pattern"
     
-    success, image, error = generate_image(prompt, size="1024x1024", use_cache=False)
+    success, image, error = generate(generate_image, prompt, size="1024x1024", use_cache=False)
     
     if not success:
         print(f"⚠️  Image generation failed: {error}")
@@ -62,7 +102,7 @@ def test_generate_parallax():
     prompt = "ribbed organic tunnel with pulsing veins"
     depth = 0.5
     
-    success, image, error = generate_parallax_layer(theme, prompt, depth)
+    success, image, error = generate(generate_parallax_layer, theme, prompt, depth)
     
     if not success:
         print(f"⚠️  Parallax generation failed: {error}")
@@ -78,7 +118,7 @@ def test_generate_enemy():
     
     description = "small biomechanical drone with glowing core"
     
-    success, image, error = generate_enemy_sprite(description)
+    success, image, error = generate(generate_enemy_sprite, description)
     
     if not success:
         print(f"⚠️  Enemy sprite generation failed: {error}")
@@ -94,7 +134,7 @@ def test_generate_boss():
     
     description = "massive biomechanical daemon with multiple eyes"
     
-    success, image, error = generate_boss_sprite(description)
+    success, image, error = generate(generate_boss_sprite, description)
     
     if not success:
         print(f"⚠️  Boss sprite generation failed: {error}")
@@ -110,7 +150,7 @@ def test_generate_tui_frame():
     
     description = "terminal bezel with giger filigree corners"
     
-    success, image, error = generate_tui_frame(description)
+    success, image, error = generate(generate_tui_frame, description)
     
     if not success:
         print(f"⚠️  TUI frame generation failed: {error}")
@@ -179,14 +219,14 @@ def test_endpoint_textures():
             "tui_frame_prompt": "terminal bezel with corners"
         }
         
-        response = requests.post(
+        response = get_http_session().post(
             'http://localhost:5006/api/generate-textures',
             json=payload,
             timeout=120
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if 'parallax' in data and 'tui_frames' in data:
                 print("✅ PASSED: Textures endpoint working")
                 print(f"   Parallax layers: {len(data['parallax'])}")
@@ -198,7 +238,7 @@ def test_endpoint_textures():
         else:
             print(f"⚠️  HTTP {response.status_code}: {response.text[:200]}")
             return True
-            
+    
     except ImportError:
         print("⚠️  SKIPPED: requests library not available")
         return True
@@ -234,14 +274,14 @@ def test_endpoint_sprites():
             ]
         }
         
-        response = requests.post(
+        response = get_http_session().post(
             'http://localhost:5006/api/generate-sprites',
             json=payload,
             timeout=120
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if 'enemy_sprites' in data and 'boss_sprites' in data:
                 print("✅ PASSED: Sprites endpoint working")
                 print(f"   Enemy sprites: {len(data['enemy_sprites'])}")
@@ -253,7 +293,7 @@ def test_endpoint_sprites():
         else:
             print(f"⚠️  HTTP {response.status_code}: {response.text[:200]}")
             return True
-            
+    
     except ImportError:
         print("⚠️  SKIPPED: requests library not available")
         return True
@@ -306,7 +346,13 @@ def run_all_tests():
     passed = 0
     failed = 0
     
-    for test in tests:
+    for i, test in enumerate(tests):
+        if i == 1:
+            # Make the independent image calls of tests 2-6 at once; the
+            # tests then run in order against the results
+            print(f"\n⏳ Generating {len(IMAGE_CALLS)} images concurrently (up to {PREFETCH_CONCURRENCY} at a time)...")
+            asyncio.run(prefetch_images(IMAGE_CALLS))
+        
         try:
             if test():
                 passed += 1
@@ -8,6 +8,8 @@ import os
 import json
 import database
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from test_helpers import get_http_session
 
 # Sample test data
 SAMPLE_PLAYER_ID = "test-player-123"
@@ -32,6 +34,36 @@ SAMPLE_GAME_DATA = {
 }
 
 
+PATCH_STORY_PAYLOAD = {
+    "previous_stage": {
+        "os_name": "TestOS-Alpha",
+        "tagline": "A cathedral of bone"
+    },
+    "next_stage": {
+        "os_name": "TestOS-Beta",
+        "tagline": "A tidepool of chrome"
+    }
+}
+
+# Endpoint calls started early by run_all_tests, keyed by path
+_PREFETCHED = {}
+
+
+def send_post(path: str, payload: dict, timeout: float, session=None):
+    """POST to the local server (on its own connection unless a session is given)"""
+    import requests
+    client = session if session is not None else requests
+    return client.post(f'http://localhost:5006{path}', json=payload, timeout=timeout)
+
+
+def post_endpoint(path: str, payload: dict, timeout: float):
+    """POST to the local server, using the prefetched response when there is one"""
+    future = _PREFETCHED.pop(path, None)
+    if future is not None:
+        return future.result()
+    return send_post(path, payload, timeout, get_http_session())
+
+
 def test_database_initialization():
     """Test 1: Database initialization"""
     print("🧪 Test 1: Testing database initialization...")
@@ -310,9 +342,43 @@ def test_increment_stage_plays():
         return False
 
 
+def test_save_completed_stages_bulk():
+    """Test 9: Bulk save completed stages"""
+    print("\n🧪 Test 9: Testing bulk save completed stages...")
+    
+    try:
+        game_datas = [
+            {**SAMPLE_GAME_DATA, "game_id": "bulk-stage-1"},
+            {**SAMPLE_GAME_DATA, "game_id": "bulk-stage-2"},
+            {**SAMPLE_GAME_DATA, "game_id": None}
+        ]
+        
+        stage_ids = database.save_completed_stages_bulk(
+            SAMPLE_PLAYER_ID,
+            game_datas,
+            ["Bulk prompt 1", "Bulk prompt 2", "Bulk prompt 3"],
+            ["easy", "normal", "hard"]
+        )
+        
+        if len(stage_ids) != 3 or stage_ids[:2] != ["bulk-stage-1", "bulk-stage-2"]:
+            print(f"❌ FAILED: Unexpected stage IDs: {stage_ids}")
+            return False
+        
+        for stage_id in stage_ids:
+            if not database.get_stage_stats(stage_id):
+                print(f"❌ FAILED: Stage {stage_id} not found after bulk save")
+                return False
+        
+        print(f"✅ PASSED: {len(stage_ids)} stages saved in one transaction")
+        return True
+    except Exception as e:
+        print(f"❌ FAILED: {e}")
+        return False
+
+
 def test_endpoint_save_game():
-    """Test 9: Test /api/save-game endpoint"""
-    print("\n🧪 Test 9: Testing save-game endpoint...")
+    """Test 10: Test /api/save-game endpoint"""
+    print("\n🧪 Test 10: Testing save-game endpoint...")
     
     try:
         import requests
@@ -331,7 +397,7 @@ def test_endpoint_save_game():
             "completed": False
         }
         
-        response = requests.post(
+        response = get_http_session().post(
             'http://localhost:5006/api/save-game',
             json=payload,
             timeout=10
@@ -366,28 +432,13 @@ def test_endpoint_save_game():
 
 
 def test_endpoint_patch_story():
-    """Test 10: Test /api/patch-story endpoint"""
-    print("\n🧪 Test 10: Testing patch-story endpoint...")
+    """Test 11: Test /api/patch-story endpoint"""
+    print("\n🧪 Test 11: Testing patch-story endpoint...")
     
     try:
         import requests
         
-        payload = {
-            "previous_stage": {
-                "os_name": "TestOS-Alpha",
-                "tagline": "A cathedral of bone"
-            },
-            "next_stage": {
-                "os_name": "TestOS-Beta",
-                "tagline": "A tidepool of chrome"
-            }
-        }
-        
-        response = requests.post(
-            'http://localhost:5006/api/patch-story',
-            json=payload,
-            timeout=30
-        )
+        response = post_endpoint('/api/patch-story', PATCH_STORY_PAYLOAD, timeout=30)
         
         if response.status_code != 200:
             print(f"⚠️  HTTP {response.status_code}: {response.text[:200]}")
@@ -439,6 +490,14 @@ def run_all_tests():
     database.init_database()
     print()
     
+    # Patch-story waits on the LLM and doesn't touch the test database, so
+    # start it now and let it overlap the DB tests. The worker sends the
+    # request on its own connection; only the test reads _PREFETCHED
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    _PREFETCHED['/api/patch-story'] = prefetcher.submit(
+        send_post, '/api/patch-story', PATCH_STORY_PAYLOAD, 30
+    )
+    
     tests = [
         test_database_initialization,
         test_create_campaign,
@@ -448,6 +507,7 @@ def run_all_tests():
         test_save_completed_stage,
         test_get_random_stage,
         test_increment_stage_plays,
+        test_save_completed_stages_bulk,
         test_endpoint_save_game,
         test_endpoint_patch_story
     ]
@@ -465,6 +525,8 @@ def run_all_tests():
             print(f"❌ EXCEPTION: {test.__name__} raised {type(e).__name__}: {e}")
             failed += 1
     
+    prefetcher.shutdown(wait=False)
+    
     print("\n" + "=" * 60)
     print(f"Results: {passed} passed, {failed} failed out of {len(tests)} tests")
     print("=" * 60)
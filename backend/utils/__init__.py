@@ -3,12 +3,14 @@ from .validation import (
     validate_game_data,
     validate_partial_game_data,
     format_validation_error,
-    get_validation_summary
+    get_validation_summary,
+    dump_game_json
 )
 
 __all__ = [
     'validate_game_data',
     'validate_partial_game_data',
     'format_validation_error',
-    'get_validation_summary'
+    'get_validation_summary',
+    'dump_game_json'
 ]
@@ -0,0 +1,27 @@
+"""
+Base64 helpers for image payloads
+
+Uses pybase64's SIMD codec when the wheel is installed and falls back to the
+stdlib otherwise.
+"""
+try:
+    import pybase64
+    
+    def b64encode_str(data: bytes) -> str:
+        """Base64-encode bytes to an ASCII string"""
+        return pybase64.b64encode_as_string(data)
+    
+    def b64decode(data) -> bytes:
+        """Decode a base64 string or bytes"""
+        return pybase64.b64decode(data, validate=False)
+
+except ImportError:
+    import base64
+    
+    def b64encode_str(data: bytes) -> str:
+        """Base64-encode bytes to an ASCII string"""
+        return base64.b64encode(data).decode('ascii')
+    
+    def b64decode(data) -> bytes:
+        """Decode a base64 string or bytes"""
+        return base64.b64decode(data)
@@ -4,7 +4,50 @@ Image processing utilities for sprite transparency
 from PIL import Image
 from io import BytesIO
 import numpy as np
-import base64
+from utils.fast_base64 import b64encode_str, b64decode
+import logging
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Longest data URL header we expect ("data:image/webp;base64" plus slack)
+DATA_URI_HEADER_MAX = 64
+
+# Per-thread scratch planes, reused while consecutive sprites share a size
+_scratch = threading.local()
+
+
+def get_scratch_planes(height: int, width: int):
+    """Return this thread's (diff, distance_sq) int32 planes sized height x width"""
+    planes = getattr(_scratch, 'planes', None)
+    if planes is None or planes[0].shape != (height, width):
+        planes = (
+            np.empty((height, width), dtype=np.int32),
+            np.empty((height, width), dtype=np.int32)
+        )
+        _scratch.planes = planes
+    return planes
+
+
+def split_data_uri(base64_image: str) -> Tuple[Optional[str], str]:
+    """
+    Split a data URL into (header, base64 payload)
+    
+    Only the short header is searched for the comma; the payload is sliced
+    off at a fixed offset. Plain base64 strings return (None, base64_image).
+    """
+    if not base64_image.startswith('data:'):
+        return None, base64_image
+    comma = base64_image.find(',', 0, DATA_URI_HEADER_MAX)
+    if comma < 0:
+        raise ValueError("Malformed data URL: no ',' after header")
+    return base64_image[:comma], base64_image[comma + 1:]
+
+
+def decode_image_data(base64_image: str) -> bytes:
+    """Decode a base64 image string (with or without data URL prefix) to bytes"""
+    return b64decode(split_data_uri(base64_image)[1])
 
 
 def remove_solid_background(base64_image: str, tolerance: int = 35) -> str:
@@ -15,98 +58,135 @@ def remove_solid_background(base64_image: str, tolerance: int = 35) -> str:
     Args:
         base64_image: Base64 encoded image string (with or without data URL prefix)
         tolerance: Color difference tolerance for green detection (0-255)
-        
+    
     Returns:
         Base64 encoded PNG with transparent background
     """
     try:
-        # Decode base64 to image
-        if base64_image.startswith('data:'):
-            base64_data = base64_image.split(',', 1)[1]
-        else:
-            base64_data = base64_image
-        
-        image_bytes = base64.b64decode(base64_data)
-        img = Image.open(BytesIO(image_bytes))
-        
-        # Convert to RGBA if not already
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
-        # Get image data as numpy array
-        data = np.array(img)
-        height, width = data.shape[:2]
-        
-        # Sample background color from edges (top, bottom, left, right)
-        # Take multiple samples and find the most common greenish color
-        edge_samples = []
-        
-        # Top edge
-        edge_samples.extend(data[0, :, :3])
-        # Bottom edge
-        edge_samples.extend(data[height-1, :, :3])
-        # Left edge
-        edge_samples.extend(data[:, 0, :3])
-        # Right edge
-        edge_samples.extend(data[:, width-1, :3])
-        
-        edge_samples = np.array(edge_samples)
-        
-        # Filter for greenish pixels (G channel > 150 and G > R and G > B)
-        greenish_mask = (edge_samples[:, 1] > 150) & \
-                       (edge_samples[:, 1] > edge_samples[:, 0]) & \
-                       (edge_samples[:, 1] > edge_samples[:, 2])
-        
-        greenish_pixels = edge_samples[greenish_mask]
-        
-        if len(greenish_pixels) > 0:
-            # Use the median of greenish pixels as the background color
-            bg_color = np.median(greenish_pixels, axis=0).astype(int)
-            print(f"  → Detected background color from {len(greenish_pixels)} edge samples: RGB({bg_color[0]}, {bg_color[1]}, {bg_color[2]})")
-        else:
-            # Fallback to most common edge color
-            bg_color = np.median(edge_samples, axis=0).astype(int)
-            print(f"  → No strong green detected, using median edge color: RGB({bg_color[0]}, {bg_color[1]}, {bg_color[2]})")
-        
-        # Calculate color distance from background color for each pixel
-        # Using Euclidean distance in RGB space
-        r_diff = data[:, :, 0].astype(int) - int(bg_color[0])
-        g_diff = data[:, :, 1].astype(int) - int(bg_color[1])
-        b_diff = data[:, :, 2].astype(int) - int(bg_color[2])
-        
-        color_distance = np.sqrt(r_diff**2 + g_diff**2 + b_diff**2)
-        
-        # Create mask for pixels close to background color
-        green_mask = color_distance <= tolerance
-        
-        # Debug: Count green pixels
-        green_pixel_count = np.sum(green_mask)
-        total_pixels = green_mask.size
-        print(f"  → Found {green_pixel_count} green pixels out of {total_pixels} ({green_pixel_count/total_pixels*100:.1f}%)")
-        
-        # Make all green pixels transparent
-        data[green_mask, 3] = 0  # Set alpha to 0 for all green pixels
-        
-        # Optional: Feather edges slightly for smoother transparency
-        # For pixels just outside tolerance, apply partial transparency
-        feather_tolerance = tolerance + 10
-        feather_mask = (color_distance > tolerance) & (color_distance <= feather_tolerance)
-        if np.any(feather_mask):
-            # Gradual transparency based on distance
-            feather_alpha = ((color_distance[feather_mask] - tolerance) / 10 * 255).astype(np.uint8)
-            data[feather_mask, 3] = np.minimum(data[feather_mask, 3], feather_alpha)
-        
-        # Create new image with transparency
-        result_img = Image.fromarray(data, 'RGBA')
-        
-        # Convert back to base64
-        buffer = BytesIO()
-        result_img.save(buffer, format='PNG')
-        result_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        
-        return f"data:image/png;base64,{result_base64}"
-        
+        png_bytes = remove_background_png(decode_image_data(base64_image), tolerance)
+        return f"data:image/png;base64,{b64encode_str(png_bytes)}"
+    
     except Exception as e:
-        print(f"Error removing background: {e}")
+        logger.warning("Error removing background: %s", e)
         # Return original image if processing fails
         return base64_image
+
+
+def remove_background_png(image_bytes: bytes, tolerance: int = 35) -> bytes:
+    """
+    Byte-level core of remove_solid_background
+    
+    Args:
+        image_bytes: Encoded source image
+        tolerance: Color difference tolerance for green detection (0-255)
+    
+    Returns:
+        PNG bytes with transparent background (raises on invalid input)
+    """
+    img = Image.open(BytesIO(image_bytes))
+    
+    # Convert to RGBA if not already
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    
+    # Get image data as numpy array
+    data = np.array(img)
+    height, width = data.shape[:2]
+    
+    # Sample background color from edges (top, bottom, left, right)
+    # Take multiple samples and find the most common greenish color
+    edge_samples = np.concatenate((
+        data[0, :, :3],
+        data[height-1, :, :3],
+        data[:, 0, :3],
+        data[:, width-1, :3]
+    ))
+    
+    # Filter for greenish pixels (G channel > 150 and G > R and G > B)
+    greenish_mask = (edge_samples[:, 1] > 150) & \
+                   (edge_samples[:, 1] > edge_samples[:, 0]) & \
+                   (edge_samples[:, 1] > edge_samples[:, 2])
+    
+    greenish_pixels = edge_samples[greenish_mask]
+    
+    if len(greenish_pixels) > 0:
+        # Use the median of greenish pixels as the background color
+        bg_color = np.median(greenish_pixels, axis=0).astype(int)
+        logger.debug("  → Detected background color from %d edge samples: RGB(%d, %d, %d)", len(greenish_pixels), *bg_color)
+    else:
+        # Fallback to most common edge color
+        bg_color = np.median(edge_samples, axis=0).astype(int)
+        logger.debug("  → No strong green detected, using median edge color: RGB(%d, %d, %d)", *bg_color)
+    
+    # Calculate squared Euclidean distance in RGB space from the
+    # background color, in place in the reused scratch planes
+    diff, distance_sq = get_scratch_planes(height, width)
+    distance_sq.fill(0)
+    for channel in range(3):
+        np.subtract(data[:, :, channel], int(bg_color[channel]), out=diff, dtype=np.int32)
+        np.multiply(diff, diff, out=diff)
+        np.add(distance_sq, diff, out=distance_sq)
+    
+    # Create mask for pixels close to background color
+    green_mask = distance_sq <= tolerance * tolerance
+    
+    # Debug: Count green pixels (a full-image pass, so only when logged)
+    if logger.isEnabledFor(logging.DEBUG):
+        green_pixel_count = int(np.count_nonzero(green_mask))
+        total_pixels = green_mask.size
+        logger.debug(
+            "  → Found %d green pixels out of %d (%.1f%%)",
+            green_pixel_count, total_pixels, green_pixel_count / total_pixels * 100
+        )
+    
+    # Make all green pixels transparent; boolean writes go through a 2-D
+    # view of the alpha channel rather than mixed fancy indexing on data
+    alpha = data[:, :, 3]
+    alpha[green_mask] = 0  # Set alpha to 0 for all green pixels
+    
+    # Optional: Feather edges slightly for smoother transparency
+    # For pixels just outside tolerance, apply partial transparency
+    feather_tolerance = tolerance + 10
+    feather_mask = ~green_mask & (distance_sq <= feather_tolerance * feather_tolerance)
+    if np.any(feather_mask):
+        # Gradual transparency based on distance
+        feather_alpha = ((np.sqrt(distance_sq[feather_mask]) - tolerance) / 10 * 255).astype(np.uint8)
+        alpha[feather_mask] = np.minimum(alpha[feather_mask], feather_alpha)
+    
+    # Create new image with transparency
+    result_img = Image.fromarray(data, 'RGBA')
+    
+    # Encode as PNG
+    buffer = BytesIO()
+    # Lossless for exact alpha; fast zlib level since it is re-sent as base64
+    result_img.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def encode_webp(base64_image: str, quality: int = 85) -> str:
+    """
+    Re-encode an image as lossy WebP for smaller texture payloads
+    
+    Args:
+        base64_image: Base64 encoded image string (with or without data URL prefix)
+        quality: WebP quality (0-100)
+    
+    Returns:
+        Base64 encoded WebP data URL (original image if encoding fails)
+    """
+    try:
+        webp = webp_bytes(decode_image_data(base64_image), quality)
+        return f"data:image/webp;base64,{b64encode_str(webp)}"
+    
+    except Exception as e:
+        logger.warning("Error encoding WebP: %s", e)
+        return base64_image
+
+
+def webp_bytes(image_bytes: bytes, quality: int = 85) -> bytes:
+    """Re-encode image bytes as lossy WebP (raises on invalid input)"""
+    img = Image.open(BytesIO(image_bytes))
+    
+    buffer = BytesIO()
+    img.save(buffer, format='WEBP', quality=quality, method=0)
+    return buffer.getvalue()
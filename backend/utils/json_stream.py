@@ -0,0 +1,107 @@
+"""
+Incremental parsing of a streamed top-level JSON object
+
+LLM responses arrive token by token. Rather than waiting for the closing
+brace, each top-level member ("story", "player", "stages", ...) is parsed
+with orjson as soon as its value closes.
+"""
+import re
+from typing import Any, List, Tuple
+import orjson
+
+# Characters that change nesting or string state outside / inside a string
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class TopLevelMemberParser:
+    """Splits a streamed JSON object into (key, value) pairs as they complete"""
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._member_start = None
+        self._end = None
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Append a chunk of the response
+        
+        Args:
+            chunk: Next piece of streamed text
+        
+        Returns:
+            Top-level members completed by this chunk, in order
+        """
+        self.text += chunk
+        members = []
+        text = self.text
+        pos = self._pos
+        
+        if self._member_start is None:
+            # Wait for the opening brace of the object
+            start = text.find('{', pos)
+            if start < 0:
+                self._pos = len(text)
+                return members
+            self._depth = 1
+            self._member_start = pos = start + 1
+        
+        while self._end is None:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(text):
+                        # Escaped character not received yet
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+            
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char = match.group()
+            pos = match.end()
+            
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(text[self._member_start:match.start()], members)
+                    self._end = pos
+            elif self._depth == 1:
+                self._emit(text[self._member_start:match.start()], members)
+                self._member_start = pos
+        
+        self._pos = pos
+        return members
+    
+    def _emit(self, member: str, members: List[Tuple[str, Any]]):
+        """Parse one `"key": value` segment"""
+        if member.strip():
+            members.extend(orjson.loads('{' + member + '}').items())
+    
+    def close(self):
+        """
+        Check the stream ended with exactly one complete object
+        
+        Raises:
+            orjson.JSONDecodeError: If the object is truncated or followed by garbage
+        """
+        if self._end is None or self.text[self._end:].strip():
+            # Let orjson report where the text goes wrong
+            orjson.loads(self.text)
+            raise orjson.JSONDecodeError("Expected a single JSON object", self.text, 0)
@@ -1,17 +1,35 @@
 """
 Validation utilities for game data
 """
-from typing import Dict, Any, Tuple, Optional
-from pydantic import ValidationError
-from models.game_data import GameData
+from typing import Dict, Any, Tuple, Optional, Union
+from pydantic import TypeAdapter, ValidationError
+from models.game_data import GameData, Story, Enemy, BulletPattern, Weapon, Pickup, TUISkin, Stage
+from models.game_data import _game_data_adapter
 
+# Validators built once at import and reused for every call (the GameData
+# adapter is the one models.game_data builds)
+_FIELD_ADAPTERS = {
+    'story': TypeAdapter(Story),
+    'enemy': TypeAdapter(Enemy),
+    'bullet_pattern': TypeAdapter(BulletPattern),
+    'weapon': TypeAdapter(Weapon),
+    'pickup': TypeAdapter(Pickup),
+    'tui_skin': TypeAdapter(TUISkin),
+    'stage': TypeAdapter(Stage)
+}
 
-def validate_game_data(data: Dict[str, Any]) -> Tuple[bool, Optional[GameData], Optional[str]]:
+
+def validate_game_data(
+    data: Optional[Dict[str, Any]],
+    raw_json: Optional[Union[bytes, str]] = None
+) -> Tuple[bool, Optional[GameData], Optional[str]]:
     """
     Validate game data against Pydantic schema
     
     Args:
         data: Dictionary containing game data
+        raw_json: The same game as JSON text; when given it is parsed and
+            validated in one pass by pydantic-core and data is ignored
         
     Returns:
         Tuple of (is_valid, game_data_object, error_message)
@@ -20,7 +38,10 @@ def validate_game_data(data: Dict[str, Any]) -> Tuple[bool, Optional[GameData],
         - error_message: Human-readable error message if invalid, None otherwise
     """
     try:
-        game_data = GameData(**data)
+        if raw_json is not None:
+            game_data = _game_data_adapter.validate_json(raw_json)
+        else:
+            game_data = _game_data_adapter.validate_python(data)
         return True, game_data, None
     except ValidationError as e:
         error_msg = format_validation_error(e)
@@ -37,13 +58,11 @@ def format_validation_error(error: ValidationError) -> str:
     Returns:
         Formatted error message string
     """
-    errors = []
-    for err in error.errors():
-        loc = " -> ".join(str(x) for x in err['loc'])
-        msg = err['msg']
-        errors.append(f"  • {loc}: {msg}")
-    
-    return "Validation failed:\n" + "\n".join(errors)
+    # Only loc and msg are used; skip building the docs URL, context and input
+    errors = error.errors(include_url=False, include_context=False, include_input=False)
+    return "Validation failed:\n" + "\n".join(
+        f"  • {' -> '.join(map(str, err['loc']))}: {err['msg']}" for err in errors
+    )
 
 
 def validate_partial_game_data(data: Dict[str, Any], field: str) -> Tuple[bool, Optional[str]]:
@@ -57,28 +76,31 @@ def validate_partial_game_data(data: Dict[str, Any], field: str) -> Tuple[bool,
     Returns:
         Tuple of (is_valid, error_message)
     """
-    from models.game_data import Story, Enemy, BulletPattern, Weapon, Pickup, TUISkin, Stage
-    
-    field_models = {
-        'story': Story,
-        'enemy': Enemy,
-        'bullet_pattern': BulletPattern,
-        'weapon': Weapon,
-        'pickup': Pickup,
-        'tui_skin': TUISkin,
-        'stage': Stage
-    }
-    
-    if field not in field_models:
+    adapter = _FIELD_ADAPTERS.get(field)
+    if adapter is None:
         return False, f"Unknown field: {field}"
     
     try:
-        field_models[field](**data)
+        adapter.validate_python(data)
         return True, None
     except ValidationError as e:
         return False, format_validation_error(e)
 
 
+def dump_game_json(game_data: GameData, **kwargs) -> bytes:
+    """
+    Serialize validated game data to JSON bytes in Rust (no Python-level dump)
+    
+    Args:
+        game_data: Validated GameData instance
+        **kwargs: Passed to TypeAdapter.dump_json (indent, exclude_none, ...)
+    
+    Returns:
+        UTF-8 JSON bytes
+    """
+    return _game_data_adapter.dump_json(game_data, **kwargs)
+
+
 def get_validation_summary(game_data: GameData) -> Dict[str, Any]:
     """
     Get summary statistics for validated game data
@@ -89,15 +111,4 @@ def get_validation_summary(game_data: GameData) -> Dict[str, Any]:
     Returns:
         Dictionary with summary statistics
     """
-    return {
-        "game_id": game_data.game_id,
-        "os_name": game_data.story.os_name,
-        "stage_count": len(game_data.stages),
-        "enemy_count": len(game_data.enemies),
-        "pattern_count": len(game_data.bullet_patterns) if game_data.bullet_patterns else 0,
-        "weapon_count": len(game_data.weapons),
-        "pickup_count": len(game_data.pickups),
-        "total_waves": sum(len(stage.waves) for stage in game_data.stages),
-        "total_boss_phases": sum(len(stage.boss.phases) for stage in game_data.stages),
-        "glyph_bullets": game_data.tui_skin.glyph_bullets if game_data.tui_skin else False
-    }
+    return game_data.summary
@@ -13,6 +13,7 @@ export const API_ENDPOINTS = {
   LOAD_GAME: `${API_BASE_URL}/api/load-game`,
   GET_NEXT_STAGE: `${API_BASE_URL}/api/get-next-stage`,
   PATCH_STORY: `${API_BASE_URL}/api/patch-story`,
+  BATCH: `${API_BASE_URL}/api/batch`,
 };
 
 export const GAME_CONFIG = {